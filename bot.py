@@ -3,15 +3,32 @@ import json
 import random
 import asyncio
 import csv
-import threading
+import io
+import time
 import re
+import difflib
+import heapq
+import logging
+import queue
+import signal
+from collections import OrderedDict, deque
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache, wraps
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from flask import Flask
+from aiohttp import web
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Poll
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from telegram.error import BadRequest, Forbidden
+from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler, AIORateLimiter
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import ConnectionFailure, PyMongoError
+from bson import ObjectId
+
+try:
+    import uvloop
+except ImportError:  # uvloop isn't available on Windows
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
@@ -21,30 +38,303 @@ BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_USER_ID = int(os.getenv('ADMIN_USER_ID'))
 PORT = int(os.getenv('PORT', 10000))
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/quizbot')
+SEND_CONCURRENCY = 25  # Parallel Telegram calls across all fan-outs (Telegram allows ~30 msg/s)
+ADMIN_CACHE_TTL = 300  # Seconds to trust a cached group admin status
+ADMIN_CACHE_SIZE = 1000  # Most (chat, user) admin checks kept at once
+STATS_FLUSH_DELAY = 5  # Seconds to coalesce stats updates before writing them
+EXPORT_BATCH_SIZE = 500  # Rows handed to the export writer thread at a time
+INVITE_LINK_DAYS = 7  # Lifetime of generated group invite links
+
+# Time input parsing (2h, 30m, 1.5h, 90m, etc.)
+TIME_INPUT_RE = re.compile(r'^(\d*\.?\d+)\s*([hm]|min|hr|hour|minute)?$')
+UNIT_SECONDS = {'m': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hr': 3600, 'hour': 3600}
+
+# Prepended to every quiz poll sent to groups (and so to reported questions)
+QUIZ_PREFIX = "🎯 Quiz Time: "
+SIMILARITY_THRESHOLD = 0.85  # Minimum SequenceMatcher ratio for near-duplicate questions
+TOKEN_JACCARD_THRESHOLD = 0.6  # Minimum shared/total words ratio before comparing characters
+SHORT_QUESTION_WORDS = 8  # Questions this short only match if they use exactly the same words
+WORD_RE = re.compile(r'\w+')
+
+# Inline button callback_data carrying an argument, e.g. "group_stats_-100123"
+CALLBACK_PREFIX_RE = re.compile(
+    r'^(remove_group|group_stats|delete_quiz|delete_similar|ignore_report|view_similar|report_back)_(.+)$'
+)
+
+# Static keyboards (Telegram markup objects are immutable, so they can be shared)
+ADMIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 View Statistics", callback_data="stats")],
+    [InlineKeyboardButton("📝 Add Quiz", callback_data="add_quiz")],
+    [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
+    [InlineKeyboardButton("📢 Broadcast", callback_data="broadcast")],
+    [InlineKeyboardButton("👥 Manage Groups", callback_data="manage_groups")],
+    [InlineKeyboardButton("📋 Export Data", callback_data="export_data")],
+    [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")],
+    [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")]
+])
+MAIN_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data="start_menu")]])
+REPORT_DONE_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("✅ Done", callback_data="close_report")]])
+REPORT_CLOSE_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("✅ Close", callback_data="close_report")]])
+REPORTS_DASHBOARD_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh", callback_data="view_reports")],
+    [InlineKeyboardButton("🗑️ Clear All Resolved", callback_data="clear_resolved_reports")],
+    [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
+    [InlineKeyboardButton("✅ Close", callback_data="close_report")]
+])
+
+STATS_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
+    [InlineKeyboardButton("📋 Export Data", callback_data="export_data")],
+    [InlineKeyboardButton("🔄 Refresh", callback_data="stats")],
+    [InlineKeyboardButton("📢 Broadcast", callback_data="broadcast")],
+    [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")],
+    [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")]
+])
+SETTINGS_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🕐 Set Quiz Interval", callback_data="set_interval")],
+    [InlineKeyboardButton("📝 Set Explanation", callback_data="set_explanation")],
+    [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
+    [InlineKeyboardButton("🔄 Refresh Groups", callback_data="refresh_groups")],
+    [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
+    [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")],
+    [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")]
+])
+MANAGE_GROUPS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh", callback_data="manage_groups")],
+    [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
+    [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
+    [InlineKeyboardButton("🔄 Reactivate All", callback_data="reactivate_all")]
+])
+GROUP_LIST_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh List", callback_data="refresh_groups")],
+    [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
+    [InlineKeyboardButton("📊 All Group Stats", callback_data="manage_groups")]
+])
+QUICK_GROUPS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔗 Get Links", callback_data="get_group_links")],
+    [InlineKeyboardButton("🔄 Refresh", callback_data="manage_groups")],
+    [InlineKeyboardButton("📊 Full Stats", callback_data="stats")]
+])
+RESET_CONFIRM_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("✅ Confirm Reset", callback_data="confirm_reset")],
+    [InlineKeyboardButton("❌ Cancel", callback_data="settings")]
+])
+ADD_QUIZ_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("📝 Add Quiz", callback_data="add_quiz")]])
+VIEW_REPORTS_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("📋 View Reports", callback_data="view_reports")]])
+CANCEL_BROADCAST_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("❌ Cancel Broadcast", callback_data="cancel_broadcast")]])
+# Shared rows for keyboards that also carry a per-chat or per-report button
+ALL_GROUPS_ROW = (InlineKeyboardButton("👥 All Groups", callback_data="manage_groups"),)
+CLOSE_REPORT_BUTTON = InlineKeyboardButton("✅ Close", callback_data="close_report")
 
 # Global bot instance
 bot_instance = None
 
+logger = logging.getLogger("bot")
+
+def setup_logging():
+    """Route log records through a queue so writing them never blocks the event loop"""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    # httpx logs every request URL at INFO, and Telegram URLs contain the bot token
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+@lru_cache(maxsize=4096)
+def format_iso_time(iso_time, fmt):
+    """Format a stored ISO timestamp, caching the result for repeated renders"""
+    return datetime.fromisoformat(iso_time).strftime(fmt)
+
+@lru_cache(maxsize=8192)
+def question_tokens(question_cf):
+    """Distinct words of a casefolded question"""
+    return frozenset(WORD_RE.findall(question_cf))
+
+REPORT_TEMPLATE = (
+    "⚠️ **QUIZ REPORTED FOR REVIEW**\n\n"
+    "📝 **Question:** {question}\n\n"
+    "📋 **Options:**\n{options}\n\n"
+    "✅ **Correct Answer:** {correct_answer}\n\n"
+    "📊 **Report Details:**\n"
+    "• 👤 Reported by: {first_name}{username}\n"
+    "• 👥 Group: {group_name}\n"
+    "• 🕐 Time: {report_time}\n"
+    "• 🔗 Message: [View Original]({message_link})\n\n"
+    "**What would you like to do with this quiz?**"
+).format
+
+GROUP_LINK_ROW = (
+    "{}. {} **{}**\n"
+    "   • ID: `{}`\n"
+    "   • Link: {}\n"
+    "   • Auto Quizzes: {}\n"
+    "   • Manual Quizzes: {}\n\n"
+).format
+
+GROUP_GONE_ROW = (
+    "{}. 🔴 **{}** (❌ Bot not in group)\n"
+    "   • ID: `{}`\n"
+    "   • Last active: {:.10}\n\n"
+).format
+
+GROUP_STATS_TEMPLATE = (
+    "📊 **Group Statistics**\n\n"
+    "🏷️ **Name:** {title}\n"
+    "🆔 **ID:** {chat_id}\n"
+    "📅 **Added:** {added}\n"
+    "📤 **Auto Quizzes Received:** {quizzes_received}\n"
+    "🎯 **Manual Quizzes Received:** {manual_quizzes_received}\n"
+    "👥 **Members:** {member_count}\n"
+    "🕐 **Last Activity:** {last_activity}\n"
+    "📊 **Status:** {status}\n"
+).format
+
+ACTIVE_GROUP_ROW = "{}. {} (ID: `{}`)\n   📊 Auto: {} | Manual: {}\n".format
+
+def format_options(options):
+    """Render quiz options as a bulleted list"""
+    return "\n".join(f"• {option}" for option in options)
+
+def format_report_text(report):
+    """Render a quiz report for the admin"""
+    reported_by = report['reported_by']
+    return REPORT_TEMPLATE(
+        question=report['question'],
+        options=report.get('options_md') or format_options(report['options']),
+        correct_answer=report['options'][report['correct_option_id']],
+        first_name=reported_by['first_name'],
+        username=f" (@{reported_by['username']})" if reported_by['username'] else "",
+        group_name=report['group_name'],
+        report_time=format_iso_time(report['report_time'], '%Y-%m-%d %H:%M:%S'),
+        message_link=report['original_message_link']
+    )
+
+def report_actions_markup(report_id):
+    """Action buttons shown under a quiz report"""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("🗑️ Delete Quiz", callback_data=f"delete_quiz_{report_id}"),
+            InlineKeyboardButton("👁️ Ignore Report", callback_data=f"ignore_report_{report_id}")
+        ],
+        [
+            InlineKeyboardButton("📝 View Similar Quizzes", callback_data=f"view_similar_{report_id}"),
+            InlineKeyboardButton("📊 View All Reports", callback_data="view_reports")
+        ]
+    ])
+
+def export_rows(docs, fieldnames, **formatters):
+    """Lazily turn documents into CSV row tuples, formatting selected fields"""
+    for doc in docs:
+        yield tuple(
+            formatters[field](doc[field]) if field in formatters and field in doc else doc.get(field)
+            for field in fieldnames
+        )
+
+def csv_bytes(fieldnames, rows):
+    """Render a header and row tuples as UTF-8 CSV bytes"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def format_reporter(reported_by):
+    """Render a report's reporter for export"""
+    return f"{reported_by['first_name']} ({reported_by['user_id']})"
+
+def json_bytes(data):
+    """Render data as pretty-printed UTF-8 JSON bytes"""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def split_message(text, limit=4000):
+    """Split text into chunks under limit at line breaks so Markdown entities stay intact"""
+    chunks = []
+    parts = []
+    size = 0
+    for line in text.split('\n'):
+        # Hard-split any single line that can't fit on its own
+        hard_split = False
+        while len(line) >= limit:
+            if parts:
+                chunks.append('\n'.join(parts))
+                parts, size = [], 0
+            chunks.append(line[:limit])
+            line = line[limit:]
+            hard_split = True
+        if hard_split and not line:
+            continue  # Nothing left over; don't start an empty chunk
+        if size + len(line) + 1 > limit:
+            chunks.append('\n'.join(parts))
+            parts, size = [], 0
+        parts.append(line)
+        size += len(line) + 1
+    if parts:
+        chunks.append('\n'.join(parts))
+    return chunks
+
+def admin_only(handler):
+    """Only run a handler for the bot admin, telling anyone else it's admin only"""
+    @wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        if update.effective_user.id != ADMIN_USER_ID:
+            if update.callback_query:
+                await update.callback_query.answer("This command is for admin only.")
+            else:
+                await update.message.reply_text("This command is for admin only.")
+            return
+        return await handler(self, update, context, *args, **kwargs)
+    return wrapper
+
 class MongoDB:
     def __init__(self, uri):
         self.uri = uri
         self.client = None
         self.db = None
-        self.connect()
     
-    def connect(self):
+    async def connect(self):
         """Connect to MongoDB"""
         try:
-            self.client = MongoClient(self.uri)
+            # One pooled client for the whole process lifetime
+            self.client = AsyncIOMotorClient(
+                self.uri,
+                maxPoolSize=20,
+                minPoolSize=2,
+                maxIdleTimeMS=30000,
+                serverSelectionTimeoutMS=5000,
+                socketTimeoutMS=45000,
+                retryWrites=True,
+                w='majority'
+            )
             self.db = self.client.quizbot
             # Test connection
-            self.client.admin.command('ping')
-            print("✅ Connected to MongoDB successfully!")
+            await self.client.admin.command('ping')
+            logger.info("✅ Connected to MongoDB successfully!")
+            await self.ensure_indexes()
         except ConnectionFailure as e:
-            print(f"❌ MongoDB connection failed: {e}")
+            logger.error("❌ MongoDB connection failed: %s", e)
             # Fallback to in-memory storage
             self.db = None
     
+    async def ensure_indexes(self):
+        """Create the indexes used by the bot's lookups"""
+        try:
+            await self.db.groups.create_index('chat_id', unique=True)
+            await self.db.groups.create_index([('is_active', 1), ('last_activity', -1)])
+            await self.db.quizzes.create_index([('is_active', 1), ('last_sent', 1)])
+            await self.db.quizzes.create_index('question_cf')
+            await self.db.quizzes.create_index('question_len')
+            await self.db.quiz_reports.create_index([('status', 1), ('report_time', -1)])
+            await self.db.quiz_reports.create_index('chat_id')
+            await self.db.invite_links.create_index('expires_at', expireAfterSeconds=0)
+        except PyMongoError as e:
+            logger.warning("⚠️ Failed to create MongoDB indexes: %s", e)
+    
     def is_connected(self):
         """Check if MongoDB is connected"""
         return self.db is not None
@@ -55,82 +345,223 @@ class MongoDB:
             return self.db[name]
         return None
     
-    def insert_one(self, collection_name, document):
+    async def insert_one(self, collection_name, document):
         """Insert one document"""
+        # Assign the id client-side so in-memory caches can key on it
+        document.setdefault('_id', ObjectId())
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.insert_one(document)
+            return await collection.insert_one(document)
         return None
     
-    def find(self, collection_name, query=None):
+    async def find(self, collection_name, query=None, projection=None, sort=None, limit=0):
         """Find documents"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return list(collection.find(query or {}))
+            cursor = collection.find(query or {}, projection, sort=sort, limit=limit)
+            return await cursor.to_list(length=None)
         return []
     
-    def find_one(self, collection_name, query):
+    async def count_documents(self, collection_name, query=None):
+        """Count matching documents without fetching them"""
+        collection = self.get_collection(collection_name)
+        if collection is not None:
+            return await collection.count_documents(query or {})
+        return 0
+    
+    async def find_cursor(self, collection_name, query=None, projection=None, batch_size=500):
+        """Iterate over matching documents, fetching them in batches"""
+        collection = self.get_collection(collection_name)
+        if collection is not None:
+            async for document in collection.find(query or {}, projection).batch_size(batch_size):
+                yield document
+    
+    async def aggregate(self, collection_name, pipeline):
+        """Run an aggregation pipeline"""
+        collection = self.get_collection(collection_name)
+        if collection is not None:
+            return await collection.aggregate(pipeline).to_list(length=None)
+        return []
+    
+    async def find_one(self, collection_name, query):
         """Find one document"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.find_one(query)
+            return await collection.find_one(query)
         return None
     
-    def update_one(self, collection_name, query, update):
+    async def update_one(self, collection_name, query, update, upsert=False):
         """Update one document"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.update_one(query, update)
+            return await collection.update_one(query, update, upsert=upsert)
         return None
     
-    def delete_one(self, collection_name, query):
+    async def update_many(self, collection_name, query, update):
+        """Update multiple documents"""
+        collection = self.get_collection(collection_name)
+        if collection is not None:
+            return await collection.update_many(query, update)
+        return None
+    
+    async def delete_one(self, collection_name, query):
         """Delete one document"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.delete_one(query)
+            return await collection.delete_one(query)
         return None
     
-    def delete_many(self, collection_name, query):
+    async def delete_many(self, collection_name, query):
         """Delete multiple documents"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.delete_many(query)
+            return await collection.delete_many(query)
         return None
     
-    def replace_one(self, collection_name, query, replacement):
+    async def replace_one(self, collection_name, query, replacement):
         """Replace one document"""
         collection = self.get_collection(collection_name)
         if collection is not None:
-            return collection.replace_one(query, replacement)
+            return await collection.replace_one(query, replacement)
+        return None
+    
+    async def bulk_write(self, collection_name, requests):
+        """Apply a batch of write operations in one round-trip"""
+        collection = self.get_collection(collection_name)
+        if collection is not None and requests:
+            return await collection.bulk_write(requests, ordered=False)
         return None
 
 class QuizBot:
     def __init__(self):
         self.application = None
         self.mongo = MongoDB(MONGODB_URI)
-        self.quizzes = self.load_quizzes()
-        self.groups = self.load_groups()
-        self.settings = self.load_settings()
-        self.stats = self.load_stats()
+        self.quizzes = {}  # _id -> quiz document
+        self.groups = {}  # chat_id -> group document
+        self.active_group_count = 0  # Cached groups marked active, kept in step by set_group_active
+        self.settings = {}
+        self.stats = {}
         self.broadcast_mode = {}
         self.scheduler_task = None
-        self.quiz_interval = self.settings.get('quiz_interval', 3600)  # Default 1 hour
-        self.recently_sent_quizzes = []  # Track recently sent quiz IDs
+        self.shutdown_event = asyncio.Event()  # Set by SIGINT/SIGTERM to stop the bot
+        self.quiz_interval = 3600  # Default 1 hour
+        self.quiz_interval_hours = 1.0
         self.max_recent_track = 10  # Keep track of last 10 sent quizzes
+        self.recently_sent_quizzes = deque(maxlen=self.max_recent_track)  # Recently sent quiz IDs, oldest first
+        self.recent_quiz_ids = set()  # Same IDs for O(1) membership checks
+        self.admin_cache = OrderedDict()  # (chat_id, user_id) -> (checked_at, member status), oldest first
+        self.background_tasks = set()  # Keep references to fire-and-forget tasks
+        self.telegram_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)  # Shared by every fan-out to Telegram
+        self.group_list_locks = {}  # user_id -> lock held while their /grouplist is being built
+        self.invite_links = None  # chat_id -> (invite link, expires_at), loaded from MongoDB on first use
+        
+        # Inline button callback_data -> handler
+        self.callback_handlers = {
+            "stats": self.show_stats,
+            "add_quiz": self.show_add_quiz_help,
+            "settings": self.show_settings,
+            "broadcast": self.start_broadcast,
+            "manage_groups": self.manage_groups,
+            "export_data": self.export_data,
+            "reset_quizzes": self.reset_quizzes_callback,
+            "confirm_reset": self.confirm_reset_quizzes,
+            "set_interval": self.set_quiz_interval_callback,
+            "set_explanation": self.set_explanation_callback,
+            "cancel_broadcast": self.cancel_broadcast,
+            "clean_inactive": self.clean_inactive_groups,
+            "reactivate_all": self.reactivate_all_groups,
+            "refresh_groups": self.refresh_groups,
+            "get_group_links": self.export_group_links,
+            "view_reports": self.handle_view_reports,
+            "clear_resolved_reports": self.handle_clear_resolved_reports,
+            "close_report": self.handle_close_report,
+            "start_menu": self.handle_start_menu,
+        }
+        # CALLBACK_PREFIX_RE action -> (handler, argument parser)
+        self.callback_prefix_handlers = {
+            "remove_group": (self.remove_group, int),
+            "group_stats": (self.show_group_stats, int),
+            "delete_quiz": (self.handle_delete_quiz, str),
+            "delete_similar": (self.handle_delete_similar_quizzes, str),
+            "ignore_report": (self.handle_ignore_report, str),
+            "view_similar": (self.handle_view_similar, str),
+            "report_back": (self.handle_report_back, str),
+        }
+        self.pending_stats_inc = {}  # Stats counter changes not yet written to MongoDB
+        self.pending_stats_set = {}  # Stats fields not yet written to MongoDB
+        self.stats_flush_task = None
+    
+    async def initialize(self):
+        """Connect to MongoDB and load cached data"""
+        await self.mongo.connect()
+        await self.reload_quizzes()
+        await self.backfill_question_fields()
+        await self.reload_groups()
+        self.settings = await self.load_settings()
+        self.stats = await self.load_stats()
+        self.quiz_interval = self.settings.get('quiz_interval', 3600)
+        self.quiz_interval_hours = self.quiz_interval / 3600
+        
+    async def reload_quizzes(self):
+        """Reload the quiz cache (keyed by _id) from MongoDB"""
+        self.quizzes = {q['_id']: q async for q in self.mongo.find_cursor('quizzes')}
+    
+    async def backfill_question_fields(self):
+        """Add the matching fields to quizzes saved before they were stored"""
+        ops = []
+        for quiz in self.quizzes.values():
+            if 'question_cf' not in quiz or 'question_len' not in quiz:
+                self.set_question_fields(quiz)
+                ops.append(UpdateOne({'_id': quiz['_id']}, {'$set': {
+                    'question_cf': quiz['question_cf'],
+                    'question_len': quiz['question_len']
+                }}))
+        if ops:
+            await self.mongo.bulk_write('quizzes', ops)
+            logger.info("✅ Added matching fields to %d quizzes", len(ops))
+    
+    def set_question_fields(self, quiz):
+        """Store the casefolded question and its length for case-insensitive matching"""
+        quiz['question_cf'] = quiz['question'].casefold()
+        quiz['question_len'] = len(quiz['question_cf'])
+    
+    async def reload_groups(self):
+        """Reload the group cache (keyed by chat_id) from MongoDB"""
+        self.groups = {g['chat_id']: g async for g in self.mongo.find_cursor('groups')}
+        self.active_group_count = sum(1 for g in self.groups.values() if g.get('is_active', True))
+    
+    def partition_groups(self):
+        """Split cached groups into active and inactive lists in one pass"""
+        active, inactive = [], []
+        for group in self.groups.values():
+            (active if group.get('is_active', True) else inactive).append(group)
+        return active, inactive
+    
+    def set_group_active(self, group, active):
+        """Flip a cached group's active flag, keeping the active count in step"""
+        if group.get('is_active', True) != active:
+            self.active_group_count += 1 if active else -1
+        group['is_active'] = active
+    
+    async def gather_limited(self, items, call):
+        """Run call(item) for every item concurrently under the shared Telegram concurrency limit
+        
+        Returns (item, result) pairs in order; a failed call's result is the exception it raised."""
+        async def run_one(item):
+            async with self.telegram_semaphore:
+                try:
+                    return item, await call(item)
+                except Exception as e:
+                    return item, e
         
-    def load_quizzes(self):
-        """Load quizzes from MongoDB"""
-        return self.mongo.find('quizzes')
-    
-    def load_groups(self):
-        """Load groups from MongoDB"""
-        return self.mongo.find('groups')
+        return await asyncio.gather(*[run_one(item) for item in items])
     
-    def load_settings(self):
+    async def load_settings(self):
         """Load settings from MongoDB"""
-        settings = self.mongo.find_one('settings', {'_id': 'bot_settings'})
+        settings = await self.mongo.find_one('settings', {'_id': 'bot_settings'})
         if not settings:
             # Default settings
+            now_iso = datetime.now().isoformat()
             settings = {
                 '_id': 'bot_settings',
                 'quiz_interval': 3600,  # 1 hour in seconds
@@ -138,15 +569,15 @@ class QuizBot:
                 'max_quizzes_per_day': 24,
                 'auto_clean_inactive': True,
                 'inactive_days_threshold': 7,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'created_at': now_iso,
+                'updated_at': now_iso
             }
-            self.mongo.insert_one('settings', settings)
+            await self.mongo.insert_one('settings', settings)
         return settings
     
-    def load_stats(self):
+    async def load_stats(self):
         """Load stats from MongoDB"""
-        stats = self.mongo.find_one('stats', {'_id': 'bot_stats'})
+        stats = await self.mongo.find_one('stats', {'_id': 'bot_stats'})
         if not stats:
             # Default stats
             stats = {
@@ -156,70 +587,156 @@ class QuizBot:
                 'quizzes_added': 0,
                 'bot_start_time': datetime.now().isoformat(),
                 'last_quiz_sent': None,
-                'group_engagement': {},
                 'total_broadcasts_sent': 0,
                 'manual_quizzes_sent': 0,
                 'quiz_reports_received': 0,
                 'quizzes_deleted_by_reports': 0
             }
-            self.mongo.insert_one('stats', stats)
+            await self.mongo.insert_one('stats', stats)
+        elif 'group_engagement' in stats:
+            await self.migrate_group_engagement(stats.pop('group_engagement'))
         return stats
     
-    def save_quiz(self, quiz):
+    async def migrate_group_engagement(self, engagement):
+        """Move per-group engagement counters out of the stats document"""
+        await self.mongo.bulk_write('group_engagement', [
+            UpdateOne({'_id': int(chat_id)}, {'$inc': {'count': count}}, upsert=True)
+            for chat_id, count in engagement.items() if count
+        ])
+        await self.mongo.update_one('stats', {'_id': 'bot_stats'}, {'$unset': {'group_engagement': ''}})
+        logger.info("✅ Migrated engagement counters for %d groups", len(engagement))
+    
+    async def get_total_engagement(self):
+        """Sum the engagement counters of all groups"""
+        result = await self.mongo.aggregate('group_engagement', [
+            {'$group': {'_id': None, 'total': {'$sum': '$count'}}}
+        ])
+        return result[0]['total'] if result else 0
+    
+    async def save_quiz(self, quiz):
         """Save quiz to MongoDB"""
+        self.set_question_fields(quiz)
         if '_id' in quiz:
-            self.mongo.replace_one('quizzes', {'_id': quiz['_id']}, quiz)
+            await self.mongo.replace_one('quizzes', {'_id': quiz['_id']}, quiz)
         else:
-            result = self.mongo.insert_one('quizzes', quiz)
-            if result and result.inserted_id:
-                quiz['_id'] = result.inserted_id
+            await self.mongo.insert_one('quizzes', quiz)
+        self.quizzes[quiz['_id']] = quiz
     
-    def save_group(self, group):
+    async def save_group(self, group):
         """Save group to MongoDB"""
         if '_id' in group:
-            self.mongo.replace_one('groups', {'_id': group['_id']}, group)
+            await self.mongo.replace_one('groups', {'_id': group['_id']}, group)
         else:
-            result = self.mongo.insert_one('groups', group)
-            if result and result.inserted_id:
-                group['_id'] = result.inserted_id
-    
-    def save_settings(self):
+            await self.mongo.insert_one('groups', group)
+        if group['chat_id'] not in self.groups and group.get('is_active', True):
+            self.active_group_count += 1
+        self.groups[group['chat_id']] = group
+    
+    async def update_quiz(self, quiz, increments=None, fields=None):
+        """Atomically update quiz counters/fields and mirror them in memory"""
+        update = {}
+        if increments:
+            for key, amount in increments.items():
+                quiz[key] = quiz.get(key, 0) + amount
+            update['$inc'] = increments
+        if fields:
+            quiz.update(fields)
+            update['$set'] = fields
+        await self.mongo.update_one('quizzes', {'_id': quiz['_id']}, update)
+    
+    async def save_settings(self):
         """Save settings to MongoDB"""
         self.settings['updated_at'] = datetime.now().isoformat()
-        self.mongo.replace_one('settings', {'_id': 'bot_settings'}, self.settings)
-    
-    def save_stats(self):
-        """Save stats to MongoDB"""
-        self.mongo.replace_one('stats', {'_id': 'bot_stats'}, self.stats)
+        await self.mongo.replace_one('settings', {'_id': 'bot_settings'}, self.settings)
+    
+    async def update_stats(self, increments=None, fields=None):
+        """Update stats in memory and queue the change for a coalesced write"""
+        if fields:
+            self.stats.update(fields)
+            self.pending_stats_set.update(fields)
+            for key in fields:
+                self.pending_stats_inc.pop(key, None)
+        if increments:
+            for key, amount in increments.items():
+                self.stats[key] = self.stats.get(key, 0) + amount
+                if key in self.pending_stats_set:
+                    # Can't $inc and $set the same field, fold it into the pending value
+                    self.pending_stats_set[key] = self.stats[key]
+                else:
+                    self.pending_stats_inc[key] = self.pending_stats_inc.get(key, 0) + amount
+        
+        if self.stats_flush_task is None:
+            self.stats_flush_task = asyncio.create_task(self.flush_stats_later())
+    
+    async def flush_stats_later(self):
+        """Write queued stats changes after a short delay"""
+        await asyncio.sleep(STATS_FLUSH_DELAY)
+        self.stats_flush_task = None
+        await self.flush_stats()
+    
+    async def flush_stats(self):
+        """Write queued stats changes to MongoDB in a single update"""
+        update = {}
+        if self.pending_stats_inc:
+            update['$inc'] = self.pending_stats_inc
+            self.pending_stats_inc = {}
+        if self.pending_stats_set:
+            update['$set'] = self.pending_stats_set
+            self.pending_stats_set = {}
+        if not update:
+            return
+        try:
+            await self.mongo.update_one('stats', {'_id': 'bot_stats'}, update)
+        except PyMongoError as e:
+            logger.error("❌ Failed to save stats: %s", e)
 
-    def get_random_quiz(self, exclude_recent_count=8):
+    async def get_random_quiz(self, exclude_recent_count=8):
         """Get a random quiz that hasn't been sent recently - IMPROVED ANTI-REPEAT"""
+        if self.mongo.is_connected():
+            # Let MongoDB sample among active quizzes that weren't sent recently
+            sampled = await self.mongo.aggregate('quizzes', [
+                {'$match': {'is_active': True, '_id': {'$nin': list(self.recent_quiz_ids)}}},
+                {'$sample': {'size': 1}}
+            ])
+            if not sampled:
+                # All quizzes were sent recently, use the least recently sent one
+                logger.info("🔄 All quizzes recently sent, using least recent ones")
+                sampled = await self.mongo.aggregate('quizzes', [
+                    {'$match': {'is_active': True}},
+                    {'$sort': {'last_sent': 1}},
+                    {'$limit': 1}
+                ])
+            if sampled:
+                quiz = self.quizzes.get(sampled[0]['_id'], sampled[0])
+                logger.debug("🎯 Selected quiz: %.50s...", quiz['question'])
+                return quiz
+        
+        return self.get_random_cached_quiz()
+    
+    def get_random_cached_quiz(self):
+        """Pick a random quiz from the in-memory cache, preferring ones not sent recently"""
         if not self.quizzes:
             return None
         
         # Get active quizzes only
-        active_quizzes = [q for q in self.quizzes if q.get('is_active', True)]
+        active_quizzes = [q for q in self.quizzes.values() if q.get('is_active', True)]
         if not active_quizzes:
             return None
         
-        print(f"🔍 Available quizzes: {len(active_quizzes)}, Recently sent: {len(self.recently_sent_quizzes)}")
+        logger.debug("🔍 Available quizzes: %d, Recently sent: %d", len(active_quizzes), len(self.recently_sent_quizzes))
         
         # If we have very few quizzes, just return a random one
         if len(active_quizzes) <= 3:
             quiz = random.choice(active_quizzes)
-            print(f"📝 Few quizzes available, selected: {quiz['question'][:50]}...")
+            logger.debug("📝 Few quizzes available, selected: %.50s...", quiz['question'])
             return quiz
         
-        # Remove old entries from recently_sent_quizzes if it gets too large
-        if len(self.recently_sent_quizzes) > self.max_recent_track:
-            self.recently_sent_quizzes = self.recently_sent_quizzes[-self.max_recent_track:]
-        
         # Get quizzes that haven't been sent recently
-        available_quizzes = [q for q in active_quizzes if q['_id'] not in self.recently_sent_quizzes]
+        available_quizzes = [q for q in active_quizzes if q['_id'] not in self.recent_quiz_ids]
         
         # If no available quizzes (all were sent recently), use least recently sent
         if not available_quizzes:
-            print("🔄 All quizzes recently sent, using least recent ones")
+            logger.info("🔄 All quizzes recently sent, using least recent ones")
             # Sort by last_sent date (oldest first)
             available_quizzes = sorted(
                 active_quizzes,
@@ -232,60 +749,55 @@ class QuizBot:
         else:
             quiz = random.choice(available_quizzes)
         
-        print(f"🎯 Selected quiz: {quiz['question'][:50]}...")
+        logger.debug("🎯 Selected quiz: %.50s...", quiz['question'])
         return quiz
 
     def track_recent_quiz(self, quiz_id):
         """Track a quiz as recently sent"""
-        if quiz_id in self.recently_sent_quizzes:
+        if quiz_id in self.recent_quiz_ids:
             self.recently_sent_quizzes.remove(quiz_id)
+        elif len(self.recently_sent_quizzes) == self.max_recent_track:
+            # The deque is about to evict its oldest entry
+            self.recent_quiz_ids.discard(self.recently_sent_quizzes[0])
         self.recently_sent_quizzes.append(quiz_id)
-        
-        # Keep only recent ones
-        if len(self.recently_sent_quizzes) > self.max_recent_track:
-            self.recently_sent_quizzes = self.recently_sent_quizzes[-self.max_recent_track:]
+        self.recent_quiz_ids.add(quiz_id)
 
     async def ensure_group_registered(self, chat_id, chat_title=None):
         """Ensure a group is registered in the database"""
-        existing_group = self.mongo.find_one('groups', {'chat_id': chat_id})
+        existing_group = self.groups.get(chat_id)
         
         if not existing_group:
             # Register the group
+            now_iso = datetime.now().isoformat()
             group_info = {
                 'chat_id': chat_id,
                 'title': chat_title or f"Group {chat_id}",
-                'added_date': datetime.now().isoformat(),
+                'added_date': now_iso,
                 'member_count': 0,
                 'quizzes_received': 0,
                 'manual_quizzes_received': 0,
-                'last_activity': datetime.now().isoformat(),
+                'last_activity': now_iso,
                 'is_active': True
             }
-            self.mongo.insert_one('groups', group_info)
-            self.groups = self.load_groups()  # Reload groups
-            print(f"✅ Auto-registered group: {chat_title or chat_id}")
+            await self.save_group(group_info)
+            logger.info("✅ Auto-registered group: %s", chat_title or chat_id)
+            return group_info
         
-        return self.mongo.find_one('groups', {'chat_id': chat_id})
+        return existing_group
     
     def parse_time_input(self, time_str):
         """Parse time input with various formats (2h, 30m, 1.5h, 90m, etc.)"""
         time_str = time_str.lower().strip()
         
         # Regex to match numbers and units
-        match = re.match(r'^(\d*\.?\d+)\s*([hm]|min|hr|hour|minute)?$', time_str)
+        match = TIME_INPUT_RE.match(time_str)
         if not match:
             return None
         
-        value = float(match.group(1))
-        unit = match.group(2) or 'h'  # Default to hours if no unit specified
+        value, unit = match.groups()
         
-        # Convert to seconds
-        if unit in ['m', 'min', 'minute']:
-            return int(value * 60)  # minutes to seconds
-        elif unit in ['h', 'hr', 'hour']:
-            return int(value * 3600)  # hours to seconds
-        else:
-            return None
+        # Convert to seconds, defaulting to hours if no unit specified
+        return int(float(value) * UNIT_SECONDS[unit or 'h'])
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
@@ -294,33 +806,19 @@ class QuizBot:
         
         if chat_type == 'private':
             if user_id == ADMIN_USER_ID:
-                keyboard = [
-                    [InlineKeyboardButton("📊 View Statistics", callback_data="stats")],
-                    [InlineKeyboardButton("📝 Add Quiz", callback_data="add_quiz")],
-                    [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
-                    [InlineKeyboardButton("📢 Broadcast", callback_data="broadcast")],
-                    [InlineKeyboardButton("👥 Manage Groups", callback_data="manage_groups")],
-                    [InlineKeyboardButton("📋 Export Data", callback_data="export_data")],
-                    [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")],
-                    [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                quiz_interval_hours = self.quiz_interval / 3600
-                
                 await update.message.reply_text(
                     f"👋 **Admin Dashboard**\n\n"
                     f"I'm your Quiz Bot! Choose an option below:\n\n"
                     f"📊 **Statistics** - View detailed bot analytics\n"
                     f"📝 **Add Quiz** - Create and send me a QUIZ MODE poll to save as quiz\n"
-                    f"⚙️ **Settings** - Configure bot settings (Current: {quiz_interval_hours}h interval)\n"
+                    f"⚙️ **Settings** - Configure bot settings (Current: {self.quiz_interval_hours}h interval)\n"
                     f"📢 **Broadcast** - Send message to all groups\n"
                     f"👥 **Manage Groups** - View and manage groups\n"
                     f"📋 **Export Data** - Export quizzes and stats\n"
                     f"🔄 **Reset Quizzes** - Delete all saved quizzes\n"
                     f"⚠️ **View Reports** - Check reported quizzes\n\n"
                     f"To add a quiz: Create a QUIZ MODE poll and send it to me!",
-                    reply_markup=reply_markup
+                    reply_markup=ADMIN_MENU_MARKUP
                 )
             else:
                 await update.message.reply_text(
@@ -339,32 +837,36 @@ class QuizBot:
         chat_id = update.effective_chat.id
         chat_title = update.effective_chat.title
         
-        # Check if group already exists in MongoDB
-        existing_group = self.mongo.find_one('groups', {'chat_id': chat_id})
+        # Check if group is already registered
+        existing_group = self.groups.get(chat_id)
         
+        now_iso = datetime.now().isoformat()
         group_info = {
             'chat_id': chat_id,
             'title': chat_title,
-            'added_date': datetime.now().isoformat(),
-            'member_count': update.effective_chat.get_member_count() if update.effective_chat.get_member_count else 0,
+            'added_date': now_iso,
+            'member_count': existing_group.get('member_count', 0) if existing_group else 0,
             'quizzes_received': existing_group['quizzes_received'] if existing_group else 0,
             'manual_quizzes_received': existing_group['manual_quizzes_received'] if existing_group else 0,
-            'last_activity': datetime.now().isoformat(),
+            'last_activity': now_iso,
             'is_active': True
         }
         
         if existing_group:
             # Update existing group
-            group_info['_id'] = existing_group['_id']
-            self.mongo.replace_one('groups', {'_id': existing_group['_id']}, group_info)
+            self.set_group_active(existing_group, True)
+            existing_group.update(group_info)
+            await self.save_group(existing_group)
             message = f"🎉 I'm back in {chat_title}! I'll continue sending quiz polls.\n\nUse /rquiz to send an immediate quiz!"
         else:
             # Add new group
-            self.mongo.insert_one('groups', group_info)
+            await self.save_group(group_info)
             message = f"🎉 Thanks for adding me to {chat_title}!\n\nI'll send random quiz polls automatically!\n\nUse /rquiz to send an immediate quiz!"
         
-        # Reload groups from MongoDB
-        self.groups = self.load_groups()
+        # Fetch the member count in the background so the greeting isn't delayed
+        task = asyncio.create_task(self.refresh_member_count(chat_id))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
         
         # Send welcome message with group controls for admin
         if update.effective_user.id == ADMIN_USER_ID:
@@ -377,6 +879,19 @@ class QuizBot:
         else:
             await update.message.reply_text(message)
     
+    async def refresh_member_count(self, chat_id):
+        """Fetch a group's member count from Telegram and store it"""
+        try:
+            member_count = await self.application.bot.get_chat_member_count(chat_id)
+        except Exception as e:
+            logger.warning("⚠️ Could not get member count for %s: %s", chat_id, e)
+            return
+        
+        group = self.groups.get(chat_id)
+        if group:
+            group['member_count'] = member_count
+        await self.mongo.update_one('groups', {'chat_id': chat_id}, {'$set': {'member_count': member_count}})
+    
     async def handle_private_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle private messages from admin"""
         user_id = update.effective_user.id
@@ -432,10 +947,11 @@ class QuizBot:
             )
             return
         
+        option_texts = [option.text for option in poll.options]
         quiz = {
             'type': 'quiz',
             'question': poll.question,
-            'options': [option.text for option in poll.options],
+            'options': option_texts,
             'is_anonymous': poll.is_anonymous,  # Keep original setting for reference
             'allows_multiple_answers': False,  # Quiz mode doesn't allow multiple answers
             'correct_option_id': poll.correct_option_id,
@@ -447,16 +963,12 @@ class QuizBot:
             'is_active': True
         }
         
-        self.mongo.insert_one('quizzes', quiz)
-        self.stats['quizzes_added'] += 1
-        self.save_stats()
-        
-        # Reload quizzes from MongoDB
-        self.quizzes = self.load_quizzes()
+        await self.save_quiz(quiz)
+        await self.update_stats({'quizzes_added': 1})
         
         # Format options for display
-        options_text = "\n".join([f"• {option}" for option in quiz['options']])
-        correct_answer = quiz['options'][quiz['correct_option_id']]
+        options_text = format_options(option_texts)
+        correct_answer = option_texts[poll.correct_option_id]
         anonymous_status = "Anonymous" if quiz['is_anonymous'] else "Non-anonymous"
         
         await update.message.reply_text(
@@ -467,7 +979,7 @@ class QuizBot:
             f"👤 **Original Setting:** {anonymous_status}\n"
             f"📊 Total quizzes: {len(self.quizzes)}\n"
             f"👥 Will be sent to: {len(self.groups)} groups\n"
-            f"⏰ Next quiz in: {self.quiz_interval / 3600} hours\n\n"
+            f"⏰ Next quiz in: {self.quiz_interval_hours} hours\n\n"
             f"💡 Note: When sent to groups, quizzes will always be NON-ANONYMOUS (voters visible)\n"
             f"💡 Group admins can use /rquiz to send immediate quizzes!\n"
             f"⚠️ Users can report quizzes with /qreport command"
@@ -476,62 +988,83 @@ class QuizBot:
     async def send_random_quiz(self):
         """Send a random quiz poll to all groups"""
         if not self.quizzes or not self.groups:
-            print("❌ No quizzes or groups available")
+            logger.warning("❌ No quizzes or groups available")
             return
         
         # Get a random quiz that hasn't been sent recently
-        quiz = self.get_random_quiz(exclude_recent_count=8)  # Avoid last 8 sent quizzes
+        quiz = await self.get_random_quiz(exclude_recent_count=8)  # Avoid last 8 sent quizzes
         
         if not quiz:
-            print("❌ No quiz selected")
+            logger.warning("❌ No quiz selected")
             return
         
+        # One timestamp for the whole broadcast
+        now_iso = datetime.now().isoformat()
+        
         # Update quiz stats
-        quiz['sent_count'] = quiz.get('sent_count', 0) + 1
-        quiz['last_sent'] = datetime.now().isoformat()
-        self.save_quiz(quiz)
+        await self.update_quiz(quiz, {'sent_count': 1}, {'last_sent': now_iso})
         
         # Track as recently sent
         self.track_recent_quiz(quiz['_id'])
         
-        # Update global stats
-        self.stats['total_quizzes_sent'] += len(self.groups)
-        self.stats['last_quiz_sent'] = datetime.now().isoformat()
-        self.save_stats()
-        
         sent_to = 0
-        active_groups = [g for g in self.groups if g.get('is_active', True)]
+        active_groups = [g for g in self.groups.values() if g.get('is_active', True)]
+        group_ops = []
+        engagement_ops = []
+        failed_chat_ids = []
         
-        print(f"📤 Sending quiz to {len(active_groups)} active groups: {quiz['question'][:50]}...")
+        logger.info("📤 Sending quiz to %d active groups: %.50s...", len(active_groups), quiz['question'])
         
-        for group in active_groups:
-            try:
-                await self.send_quiz_to_group(group, quiz)
+        results = await self.gather_limited(active_groups, lambda group: self.send_quiz_to_group(group, quiz, now_iso))
+        
+        for group, group_update in results:
+            if not isinstance(group_update, Exception):
+                group_ops.append(group_update)
+                engagement_ops.append(UpdateOne({'_id': group['chat_id']}, {'$inc': {'count': 1}}, upsert=True))
                 sent_to += 1
-                await asyncio.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ Failed to send to group {group['chat_id']}: {e}")
-                # Mark group as inactive if sending fails repeatedly
-                group['is_active'] = False
-                self.save_group(group)
+            else:
+                logger.warning("❌ Failed to send to group %s: %s", group['chat_id'], group_update)
+                # Mark group as inactive if sending fails
+                self.set_group_active(group, False)
+                group_ops.append(UpdateOne({'_id': group['_id']}, {'$set': {'is_active': False}}))
+                failed_chat_ids.append(group['chat_id'])
         
-        # Reload groups and stats after updates
-        self.groups = self.load_groups()
-        self.save_stats()
+        # Persist all group counters in one batch
+        await self.mongo.bulk_write('groups', group_ops)
+        await self.forget_invite_links(failed_chat_ids)
+        await self.mongo.bulk_write('group_engagement', engagement_ops)
         
-        print(f"✅ Sent quiz '{quiz['question'][:30]}...' to {sent_to}/{len(active_groups)} groups at {datetime.now()}")
-        print(f"📊 Recent quizzes tracking: {len(self.recently_sent_quizzes)} quizzes")
+        # Update global stats
+        await self.update_stats(
+            {'total_quizzes_sent': len(active_groups)},
+            {'last_quiz_sent': now_iso}
+        )
+        
+        logger.info("✅ Sent quiz '%.30s...' to %d/%d groups", quiz['question'], sent_to, len(active_groups))
+        logger.debug("📊 Recent quizzes tracking: %d quizzes", len(self.recently_sent_quizzes))
     
-    async def send_quiz_to_group(self, group, quiz):
-        """Send a quiz to a specific group - ALWAYS NON-ANONYMOUS"""
+    def cache_admin_status(self, cache_key, status):
+        """Remember a member status, dropping expired entries and the oldest beyond ADMIN_CACHE_SIZE"""
+        now = time.monotonic()
+        self.admin_cache[cache_key] = (now, status)
+        # Every entry shares one TTL, so insertion order is also expiry order
+        while self.admin_cache and (
+            len(self.admin_cache) > ADMIN_CACHE_SIZE or
+            now - next(iter(self.admin_cache.values()))[0] >= ADMIN_CACHE_TTL
+        ):
+            self.admin_cache.popitem(last=False)
+    
+    async def send_quiz_to_group(self, group, quiz, now_iso=None):
+        """Send a quiz to a specific group - ALWAYS NON-ANONYMOUS
+        
+        Returns the group's counter update for the caller to persist."""
         explanation = self.settings.get('quiz_explanation', "Check back later for results!")
         
         if quiz['type'] == 'quiz':
             # Send as QUIZ MODE poll with NON-ANONYMOUS voting (ALWAYS)
-            message = await self.application.bot.send_poll(
+            await self.application.bot.send_poll(
                 chat_id=group['chat_id'],
-                question=f"🎯 Quiz Time: {quiz['question']}",
+                question=f"{QUIZ_PREFIX}{quiz['question']}",
                 options=quiz['options'],
                 is_anonymous=False,  # ALWAYS force non-anonymous voting
                 allows_multiple_answers=False,  # Quiz mode doesn't allow multiple answers
@@ -542,14 +1075,14 @@ class QuizBot:
             )
         
         # Update group stats
+        last_activity = now_iso or datetime.now().isoformat()
         group['quizzes_received'] = group.get('quizzes_received', 0) + 1
-        group['last_activity'] = datetime.now().isoformat()
-        self.save_group(group)
+        group['last_activity'] = last_activity
         
-        # Track engagement
-        if str(group['chat_id']) not in self.stats['group_engagement']:
-            self.stats['group_engagement'][str(group['chat_id'])] = 0
-        self.stats['group_engagement'][str(group['chat_id'])] += 1
+        return UpdateOne(
+            {'_id': group['_id']},
+            {'$inc': {'quizzes_received': 1}, '$set': {'last_activity': last_activity}}
+        )
     
     async def send_immediate_quiz(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /rquiz command - send immediate random quiz to current group"""
@@ -569,20 +1102,30 @@ class QuizBot:
         if user_id == ADMIN_USER_ID:
             is_admin = True
         else:
-            # Check if user is admin in the group
-            try:
-                chat_member = await context.bot.get_chat_member(chat_id, user_id)
-                if chat_member.status in ['administrator', 'creator']:
-                    is_admin = True
-            except Exception as e:
-                print(f"Error checking admin status: {e}")
+            # Check if user is admin in the group (cached for a few minutes)
+            cache_key = (chat_id, user_id)
+            cached = self.admin_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < ADMIN_CACHE_TTL:
+                status = cached[1]
+            else:
+                self.admin_cache.pop(cache_key, None)
+                status = None
+                try:
+                    chat_member = await context.bot.get_chat_member(chat_id, user_id)
+                    status = chat_member.status
+                    self.cache_admin_status(cache_key, status)
+                except Exception as e:
+                    logger.warning("Error checking admin status: %s", e)
+            
+            if status in ['administrator', 'creator']:
+                is_admin = True
         
         if not is_admin:
             await update.message.reply_text("❌ Only group admins can use this command!")
             return
         
         # Check if there are active quizzes
-        active_quizzes = [q for q in self.quizzes if q.get('is_active', True)]
+        active_quizzes = [q for q in self.quizzes.values() if q.get('is_active', True)]
         if not active_quizzes:
             await update.message.reply_text("❌ No quizzes available! Please add some quizzes first.")
             return
@@ -595,41 +1138,40 @@ class QuizBot:
         
         if not group.get('is_active', True):
             # Reactivate the group
-            group['is_active'] = True
-            self.save_group(group)
+            self.set_group_active(group, True)
+            await self.save_group(group)
         
         # Send typing action
         await context.bot.send_chat_action(chat_id=chat_id, action='typing')
         
         try:
             # Select random quiz using the same anti-repeat logic
-            quiz = self.get_random_quiz(exclude_recent_count=5)  # Slightly less strict for manual sends
+            quiz = await self.get_random_quiz(exclude_recent_count=5)  # Slightly less strict for manual sends
+            
+            now_iso = datetime.now().isoformat()
             
             # Update quiz stats for manual sends
-            quiz['manual_sent_count'] = quiz.get('manual_sent_count', 0) + 1
-            quiz['last_sent'] = datetime.now().isoformat()
-            self.save_quiz(quiz)
+            await self.update_quiz(quiz, {'manual_sent_count': 1}, {'last_sent': now_iso})
             
             # Track as recently sent
             self.track_recent_quiz(quiz['_id'])
             
+            # Send the quiz (NO confirmation message)
+            await self.send_quiz_to_group(group, quiz, now_iso)
+            
             # Update group stats for manual quizzes
             group['manual_quizzes_received'] = group.get('manual_quizzes_received', 0) + 1
-            group['last_activity'] = datetime.now().isoformat()
-            self.save_group(group)
-            
-            # Update global stats
-            self.stats['manual_quizzes_sent'] = self.stats.get('manual_quizzes_sent', 0) + 1
-            self.save_stats()
+            await self.save_group(group)
             
-            # Send the quiz (NO confirmation message)
-            await self.send_quiz_to_group(group, quiz)
+            # Update global stats and engagement
+            await self.update_stats({'manual_quizzes_sent': 1})
+            await self.mongo.update_one('group_engagement', {'_id': group['chat_id']}, {'$inc': {'count': 1}}, upsert=True)
             
             # Only log to console, don't send message to group
-            print(f"🎯 Manual quiz sent to {chat_title} by {update.effective_user.first_name}")
+            logger.info("🎯 Manual quiz sent to %s by %s", chat_title, update.effective_user.first_name)
             
         except Exception as e:
-            print(f"Error sending immediate quiz: {e}")
+            logger.error("Error sending immediate quiz: %s", e)
             await update.message.reply_text("❌ Failed to send quiz. Please try again later.")
     
     async def report_quiz_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -663,11 +1205,13 @@ class QuizBot:
             return
         
         # Extract quiz information
+        options = [option.text for option in replied_poll.options]
         quiz_info = {
             'chat_id': chat_id,
             'message_id': update.message.reply_to_message.message_id,
             'question': replied_poll.question,
-            'options': [option.text for option in replied_poll.options],
+            'options': options,
+            'options_md': format_options(options),  # Rendered once for every report view
             'correct_option_id': replied_poll.correct_option_id,
             'reported_by': {
                 'user_id': user_id,
@@ -683,15 +1227,14 @@ class QuizBot:
         report_id = f"report_{chat_id}_{message_id}"
         
         # Save report to MongoDB
-        self.mongo.insert_one('quiz_reports', {
+        await self.mongo.insert_one('quiz_reports', {
             '_id': report_id,
             'status': 'pending',  # pending, reviewed, deleted, ignored
             **quiz_info
         })
         
         # Update stats
-        self.stats['quiz_reports_received'] = self.stats.get('quiz_reports_received', 0) + 1
-        self.save_stats()
+        await self.update_stats({'quiz_reports_received': 1})
         
         # Send confirmation to the user
         await update.message.reply_text(
@@ -708,38 +1251,10 @@ class QuizBot:
         """Send quiz report to admin with action buttons"""
         
         # Format quiz information
-        options_text = "\n".join([f"• {option}" for option in quiz_info['options']])
-        correct_answer = quiz_info['options'][quiz_info['correct_option_id']]
-        
-        # Handle username display
-        username = quiz_info['reported_by']['username']
-        username_display = f" (@{username})" if username else ""
-        
-        report_text = (
-            f"⚠️ **QUIZ REPORTED FOR REVIEW**\n\n"
-            f"📝 **Question:** {quiz_info['question']}\n\n"
-            f"📋 **Options:**\n{options_text}\n\n"
-            f"✅ **Correct Answer:** {correct_answer}\n\n"
-            f"📊 **Report Details:**\n"
-            f"• 👤 Reported by: {quiz_info['reported_by']['first_name']}{username_display}\n"
-            f"• 👥 Group: {quiz_info['group_name']}\n"
-            f"• 🕐 Time: {datetime.fromisoformat(quiz_info['report_time']).strftime('%Y-%m-%d %H:%M:%S')}\n"
-            f"• 🔗 Message: [View Original]({quiz_info['original_message_link']})\n\n"
-            f"**What would you like to do with this quiz?**"
-        )
+        report_text = format_report_text(quiz_info)
         
         # Create action buttons
-        keyboard = [
-            [
-                InlineKeyboardButton("🗑️ Delete Quiz", callback_data=f"delete_quiz_{report_id}"),
-                InlineKeyboardButton("👁️ Ignore Report", callback_data=f"ignore_report_{report_id}")
-            ],
-            [
-                InlineKeyboardButton("📝 View Similar Quizzes", callback_data=f"view_similar_{report_id}"),
-                InlineKeyboardButton("📊 View All Reports", callback_data="view_reports")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = report_actions_markup(report_id)
         
         # Send to admin
         await context.bot.send_message(
@@ -749,34 +1264,90 @@ class QuizBot:
             parse_mode='Markdown'
         )
     
+    def exact_quiz_query(self, question):
+        """MongoDB filter for quizzes with the same question (case-insensitive)"""
+        return {'question_cf': question.casefold()}
+    
+    def containment_quiz_query(self, question):
+        """MongoDB filter for quizzes containing or contained in the question"""
+        needle = question.casefold()
+        # Containment is only possible one way for each length, so let the
+        # question_len index rule out most quizzes before any string matching
+        return {'$or': [
+            {'question_len': {'$gte': len(needle)}, 'question_cf': {'$regex': re.escape(needle)}},
+            {'question_len': {'$lte': len(needle)}, '$expr': {'$gte': [{'$indexOfCP': [needle, '$question_cf']}, 0]}}
+        ]}
+    
+    def similar_quiz_query(self, question):
+        """MongoDB filter for quizzes containing, contained in or closely resembling the question
+        
+        Only for showing candidates; near-duplicates can be different questions, so deletes use containment_quiz_query."""
+        query = self.containment_quiz_query(question)
+        near_ids = [quiz['_id'] for quiz in self.find_near_duplicates(question.casefold())]
+        query['$or'].append({'_id': {'$in': near_ids}})
+        return query
+    
+    def find_near_duplicates(self, needle):
+        """Find cached quizzes whose casefolded question closely resembles the needle"""
+        # SequenceMatcher caches details about seq2, so the needle goes there
+        matcher = difflib.SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(needle)
+        needle_tokens = question_tokens(needle)
+        matches = []
+        for quiz in self.quizzes.values():
+            matcher.set_seq1(quiz['question_cf'])
+            # Cheap upper bounds first; the full ratio only runs on survivors
+            if matcher.real_quick_ratio() < SIMILARITY_THRESHOLD:
+                continue
+            # Near-duplicates share most of their words, and never differ by a number
+            # ("What is 2+2?" vs "What is 2+3?") or, when short, by any word at all
+            tokens = question_tokens(quiz['question_cf'])
+            union = needle_tokens | tokens
+            differing = needle_tokens ^ tokens
+            if union and len(needle_tokens & tokens) / len(union) < TOKEN_JACCARD_THRESHOLD:
+                continue
+            if differing and (len(union) <= SHORT_QUESTION_WORDS or
+                              any(ch.isdigit() for token in differing for ch in token)):
+                continue
+            if (matcher.quick_ratio() >= SIMILARITY_THRESHOLD and
+                    matcher.ratio() >= SIMILARITY_THRESHOLD):
+                matches.append(quiz)
+        return matches
+    
+    async def delete_quizzes(self, query):
+        """Delete matching quizzes and drop them from the cache"""
+        quiz_ids = [q['_id'] for q in await self.mongo.find('quizzes', query, {'_id': 1})]
+        if not quiz_ids:
+            return 0
+        result = await self.mongo.delete_many('quizzes', {'_id': {'$in': quiz_ids}})
+        for quiz_id in quiz_ids:
+            self.quizzes.pop(quiz_id, None)
+        return result.deleted_count if result else 0
+    
     async def handle_delete_quiz(self, update: Update, context: ContextTypes.DEFAULT_TYPE, report_id: str):
         """Handle delete quiz action from admin"""
         query = update.callback_query
         await query.answer()
         
         # Get report details
-        report = self.mongo.find_one('quiz_reports', {'_id': report_id})
+        report = await self.mongo.find_one('quiz_reports', {'_id': report_id})
         if not report:
             await query.edit_message_text("❌ Report not found or already processed.")
             return
         
-        # Find and delete the quiz from database
-        deleted_count = 0
-        similar_quizzes = []
-        
-        # Find quizzes with similar question (case-insensitive partial match)
-        all_quizzes = self.mongo.find('quizzes', {})
-        for quiz in all_quizzes:
-            if quiz['question'].lower() == report['question'].lower():
-                # Exact match - delete
-                self.mongo.delete_one('quizzes', {'_id': quiz['_id']})
-                deleted_count += 1
-            elif report['question'].lower() in quiz['question'].lower() or quiz['question'].lower() in report['question'].lower():
-                # Partial match - add to similar list
-                similar_quizzes.append(quiz)
+        # Delete quizzes with the same question (case-insensitive)
+        question = report['question'].removeprefix(QUIZ_PREFIX)
+        deleted_count = await self.delete_quizzes(self.exact_quiz_query(question))
+        
+        # Partial matches that remain - add to similar list
+        similar_query = self.similar_quiz_query(question)
+        similar_count, similar_quizzes = await asyncio.gather(
+            self.mongo.count_documents('quizzes', similar_query),
+            self.mongo.find('quizzes', similar_query, {'question': 1}, limit=5)  # Show only first 5
+        )
         
         # Update report status
-        self.mongo.update_one('quiz_reports', {'_id': report_id}, {
+        await self.mongo.update_one('quiz_reports', {'_id': report_id}, {
             '$set': {
                 'status': 'deleted',
                 'action_taken': 'quiz_deleted',
@@ -786,38 +1357,32 @@ class QuizBot:
         })
         
         # Update stats
-        self.stats['quizzes_deleted_by_reports'] = self.stats.get('quizzes_deleted_by_reports', 0) + deleted_count
-        self.save_stats()
-        
-        # Reload quizzes
-        self.quizzes = self.load_quizzes()
+        await self.update_stats({'quizzes_deleted_by_reports': deleted_count})
         
         # Prepare response
-        response_text = (
+        parts = [
             f"✅ **Quiz Deleted Successfully!**\n\n"
             f"🗑️ Deleted {deleted_count} quiz(es) with matching question:\n"
             f"`{report['question'][:100]}...`\n\n"
-        )
+        ]
         
         if similar_quizzes:
-            response_text += f"⚠️ Found {len(similar_quizzes)} similar quizzes:\n"
-            for i, quiz in enumerate(similar_quizzes[:5], 1):  # Show only first 5
-                response_text += f"{i}. {quiz['question'][:80]}...\n"
+            parts.append(f"⚠️ Found {similar_count} similar quizzes:\n")
+            for i, quiz in enumerate(similar_quizzes, 1):
+                parts.append(f"{i}. {quiz['question'][:80]}...\n")
             
-            if len(similar_quizzes) > 5:
-                response_text += f"... and {len(similar_quizzes) - 5} more\n"
+            if similar_count > 5:
+                parts.append(f"... and {similar_count - 5} more\n")
             
             # Add option to delete all similar
-            keyboard = [
+            reply_markup = InlineKeyboardMarkup([
                 [InlineKeyboardButton("🗑️ Delete All Similar", callback_data=f"delete_similar_{report_id}")],
                 [InlineKeyboardButton("✅ Done", callback_data="close_report")]
-            ]
+            ])
         else:
-            keyboard = [[InlineKeyboardButton("✅ Done", callback_data="close_report")]]
+            reply_markup = REPORT_DONE_MARKUP
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(response_text, reply_markup=reply_markup)
+        await query.edit_message_text("".join(parts), reply_markup=reply_markup)
     
     async def handle_delete_similar_quizzes(self, update: Update, context: ContextTypes.DEFAULT_TYPE, report_id: str):
         """Delete all similar quizzes"""
@@ -825,24 +1390,17 @@ class QuizBot:
         await query.answer()
         
         # Get report details
-        report = self.mongo.find_one('quiz_reports', {'_id': report_id})
+        report = await self.mongo.find_one('quiz_reports', {'_id': report_id})
         if not report:
             await query.edit_message_text("❌ Report not found.")
             return
         
-        # Find and delete all similar quizzes
-        deleted_count = 0
-        all_quizzes = self.mongo.find('quizzes', {})
-        
-        for quiz in all_quizzes:
-            # Check for similarity (partial match in either direction)
-            if (report['question'].lower() in quiz['question'].lower() or 
-                quiz['question'].lower() in report['question'].lower()):
-                self.mongo.delete_one('quizzes', {'_id': quiz['_id']})
-                deleted_count += 1
+        # Delete all similar quizzes (partial match in either direction)
+        question = report['question'].removeprefix(QUIZ_PREFIX)
+        deleted_count = await self.delete_quizzes(self.containment_quiz_query(question))
         
         # Update report
-        self.mongo.update_one('quiz_reports', {'_id': report_id}, {
+        await self.mongo.update_one('quiz_reports', {'_id': report_id}, {
             '$set': {
                 'additional_deleted': deleted_count,
                 'total_deleted': report.get('deleted_quizzes', 0) + deleted_count,
@@ -851,11 +1409,7 @@ class QuizBot:
         })
         
         # Update stats
-        self.stats['quizzes_deleted_by_reports'] = self.stats.get('quizzes_deleted_by_reports', 0) + deleted_count
-        self.save_stats()
-        
-        # Reload quizzes
-        self.quizzes = self.load_quizzes()
+        await self.update_stats({'quizzes_deleted_by_reports': deleted_count})
         
         response_text = (
             f"✅ **All Similar Quizzes Deleted!**\n\n"
@@ -864,10 +1418,7 @@ class QuizBot:
             f"The quiz database has been cleaned."
         )
         
-        keyboard = [[InlineKeyboardButton("✅ Done", callback_data="close_report")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(response_text, reply_markup=reply_markup)
+        await query.edit_message_text(response_text, reply_markup=REPORT_DONE_MARKUP)
     
     async def handle_ignore_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE, report_id: str):
         """Handle ignore report action"""
@@ -875,7 +1426,7 @@ class QuizBot:
         await query.answer()
         
         # Update report status
-        self.mongo.update_one('quiz_reports', {'_id': report_id}, {
+        await self.mongo.update_one('quiz_reports', {'_id': report_id}, {
             '$set': {
                 'status': 'ignored',
                 'action_taken': 'ignored',
@@ -887,7 +1438,7 @@ class QuizBot:
             "✅ **Report Ignored**\n\n"
             "The quiz report has been marked as ignored.\n"
             "No action was taken on the quiz.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("✅ Close", callback_data="close_report")]])
+            reply_markup=REPORT_CLOSE_MARKUP
         )
     
     async def handle_view_similar(self, update: Update, context: ContextTypes.DEFAULT_TYPE, report_id: str):
@@ -896,18 +1447,20 @@ class QuizBot:
         await query.answer()
         
         # Get report details
-        report = self.mongo.find_one('quiz_reports', {'_id': report_id})
+        report = await self.mongo.find_one('quiz_reports', {'_id': report_id})
         if not report:
             await query.edit_message_text("❌ Report not found.")
             return
         
         # Find similar quizzes
-        similar_quizzes = []
-        for quiz in self.quizzes:
-            # Check for similarity
-            if (report['question'].lower() in quiz['question'].lower() or 
-                quiz['question'].lower() in report['question'].lower()):
-                similar_quizzes.append(quiz)
+        question = report['question'].removeprefix(QUIZ_PREFIX)
+        similar_query = self.similar_quiz_query(question)
+        similar_count, similar_quizzes = await asyncio.gather(
+            self.mongo.count_documents('quizzes', similar_query),
+            self.mongo.find('quizzes', similar_query, {
+                'question': 1, 'is_active': 1, 'sent_count': 1, 'manual_sent_count': 1
+            }, limit=10)  # Show only first 10
+        )
         
         if not similar_quizzes:
             response_text = (
@@ -919,26 +1472,27 @@ class QuizBot:
             
             keyboard = [
                 [InlineKeyboardButton("🔙 Back to Report", callback_data=f"report_back_{report_id}")],
-                [InlineKeyboardButton("✅ Close", callback_data="close_report")]
+                [CLOSE_REPORT_BUTTON]
             ]
         else:
-            response_text = f"📝 **Found {len(similar_quizzes)} Similar Quiz(es)**\n\n"
+            parts = [f"📝 **Found {similar_count} Similar Quiz(es)**\n\n"]
             
-            for i, quiz in enumerate(similar_quizzes[:10], 1):  # Show only first 10
+            for i, quiz in enumerate(similar_quizzes, 1):
                 status = "✅ Active" if quiz.get('is_active', True) else "❌ Inactive"
                 sent_count = quiz.get('sent_count', 0)
                 manual_count = quiz.get('manual_sent_count', 0)
                 
-                response_text += (
+                parts.append(
                     f"**{i}. {quiz['question'][:80]}...**\n"
                     f"   Status: {status} | Auto: {sent_count} | Manual: {manual_count}\n"
                     f"   ID: `{quiz['_id']}`\n\n"
                 )
             
-            if len(similar_quizzes) > 10:
-                response_text += f"... and {len(similar_quizzes) - 10} more similar quizzes\n\n"
+            if similar_count > 10:
+                parts.append(f"... and {similar_count - 10} more similar quizzes\n\n")
             
-            response_text += "**Options:**"
+            parts.append("**Options:**")
+            response_text = "".join(parts)
             
             keyboard = [
                 [
@@ -947,7 +1501,7 @@ class QuizBot:
                 ],
                 [
                     InlineKeyboardButton("🔙 Back to Report", callback_data=f"report_back_{report_id}"),
-                    InlineKeyboardButton("✅ Close", callback_data="close_report")
+                    CLOSE_REPORT_BUTTON
                 ]
             ]
         
@@ -959,30 +1513,40 @@ class QuizBot:
         query = update.callback_query
         await query.answer()
         
-        # Get all pending reports
-        pending_reports = self.mongo.find('quiz_reports', {'status': 'pending'})
-        total_reports = self.mongo.find('quiz_reports', {})
+        # Count reports and fetch only the latest pending ones we display (all indexed, run together)
+        pending_count, resolved_count, pending_reports = await asyncio.gather(
+            self.mongo.count_documents('quiz_reports', {'status': 'pending'}),
+            self.mongo.count_documents('quiz_reports', {'status': {'$ne': 'pending'}}),
+            self.mongo.find(
+                'quiz_reports',
+                {'status': 'pending'},
+                {'question': 1, 'reported_by.first_name': 1, 'group_name': 1, 'report_time': 1, 'original_message_link': 1},
+                sort=[('report_time', -1)],
+                limit=5
+            )
+        )
+        total_count = pending_count + resolved_count
         
         if not pending_reports:
             response_text = (
                 f"📊 **Quiz Reports Dashboard**\n\n"
                 f"✅ No pending reports!\n\n"
                 f"📈 **Statistics:**\n"
-                f"• Total reports: {len(total_reports)}\n"
+                f"• Total reports: {total_count}\n"
                 f"• Pending: 0\n"
-                f"• Resolved: {len([r for r in total_reports if r['status'] != 'pending'])}\n"
+                f"• Resolved: {resolved_count}\n"
             )
             
-            keyboard = [[InlineKeyboardButton("✅ Close", callback_data="close_report")]]
+            reply_markup = REPORT_CLOSE_MARKUP
         else:
-            response_text = (
+            parts = [
                 f"📊 **Quiz Reports Dashboard**\n\n"
-                f"⚠️ **Pending Reports: {len(pending_reports)}**\n\n"
-            )
+                f"⚠️ **Pending Reports: {pending_count}**\n\n"
+            ]
             
-            for i, report in enumerate(pending_reports[:5], 1):  # Show only first 5
-                report_time = datetime.fromisoformat(report['report_time']).strftime('%m/%d %H:%M')
-                response_text += (
+            for i, report in enumerate(pending_reports, 1):  # Show only latest 5
+                report_time = format_iso_time(report['report_time'], '%m/%d %H:%M')
+                parts.append(
                     f"{i}. **{report['question'][:60]}...**\n"
                     f"   👤 {report['reported_by']['first_name']} | "
                     f"👥 {report['group_name']}\n"
@@ -991,22 +1555,18 @@ class QuizBot:
                     f"   [Review](callback:report_{report['_id']})\n\n"
                 )
             
-            if len(pending_reports) > 5:
-                response_text += f"... and {len(pending_reports) - 5} more pending reports\n\n"
-            
-            response_text += f"📈 **Statistics:**\n"
-            response_text += f"• Total reports: {len(total_reports)}\n"
-            response_text += f"• Pending: {len(pending_reports)}\n"
-            response_text += f"• Resolved: {len(total_reports) - len(pending_reports)}\n"
+            if pending_count > 5:
+                parts.append(f"... and {pending_count - 5} more pending reports\n\n")
             
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh", callback_data="view_reports")],
-                [InlineKeyboardButton("🗑️ Clear All Resolved", callback_data="clear_resolved_reports")],
-                [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
-                [InlineKeyboardButton("✅ Close", callback_data="close_report")]
-            ]
+            parts.append(
+                f"📈 **Statistics:**\n"
+                f"• Total reports: {total_count}\n"
+                f"• Pending: {pending_count}\n"
+                f"• Resolved: {resolved_count}\n"
+            )
+            response_text = "".join(parts)
+            reply_markup = REPORTS_DASHBOARD_MARKUP
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await query.edit_message_text(response_text, reply_markup=reply_markup)
     
     async def handle_clear_resolved_reports(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1015,7 +1575,7 @@ class QuizBot:
         await query.answer()
         
         # Delete all non-pending reports
-        result = self.mongo.delete_many('quiz_reports', {'status': {'$ne': 'pending'}})
+        result = await self.mongo.delete_many('quiz_reports', {'status': {'$ne': 'pending'}})
         
         deleted_count = result.deleted_count if result else 0
         
@@ -1023,7 +1583,7 @@ class QuizBot:
             f"✅ **Resolved Reports Cleared**\n\n"
             f"🗑️ Deleted {deleted_count} resolved reports.\n"
             f"Only pending reports remain in the database.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📋 View Reports", callback_data="view_reports")]])
+            reply_markup=VIEW_REPORTS_MARKUP
         )
     
     async def handle_report_back(self, update: Update, context: ContextTypes.DEFAULT_TYPE, report_id: str):
@@ -1032,45 +1592,13 @@ class QuizBot:
         await query.answer()
         
         # Get report
-        report = self.mongo.find_one('quiz_reports', {'_id': report_id})
+        report = await self.mongo.find_one('quiz_reports', {'_id': report_id})
         if not report:
             await query.edit_message_text("Report not found.")
             return
         
         # Recreate the original report message
-        options_text = "\n".join([f"• {option}" for option in report['options']])
-        correct_answer = report['options'][report['correct_option_id']]
-        
-        # Handle username display
-        username = report['reported_by']['username']
-        username_display = f" (@{username})" if username else ""
-        
-        report_text = (
-            f"⚠️ **QUIZ REPORTED FOR REVIEW**\n\n"
-            f"📝 **Question:** {report['question']}\n\n"
-            f"📋 **Options:**\n{options_text}\n\n"
-            f"✅ **Correct Answer:** {correct_answer}\n\n"
-            f"📊 **Report Details:**\n"
-            f"• 👤 Reported by: {report['reported_by']['first_name']}{username_display}\n"
-            f"• 👥 Group: {report['group_name']}\n"
-            f"• 🕐 Time: {datetime.fromisoformat(report['report_time']).strftime('%Y-%m-%d %H:%M:%S')}\n"
-            f"• 🔗 Message: [View Original]({report['original_message_link']})\n\n"
-            f"**What would you like to do with this quiz?**"
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🗑️ Delete Quiz", callback_data=f"delete_quiz_{report_id}"),
-                InlineKeyboardButton("👁️ Ignore Report", callback_data=f"ignore_report_{report_id}")
-            ],
-            [
-                InlineKeyboardButton("📝 View Similar Quizzes", callback_data=f"view_similar_{report_id}"),
-                InlineKeyboardButton("📊 View All Reports", callback_data="view_reports")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(report_text, reply_markup=reply_markup)
+        await query.edit_message_text(format_report_text(report), reply_markup=report_actions_markup(report_id))
     
     async def handle_close_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Close the report message"""
@@ -1080,21 +1608,16 @@ class QuizBot:
         await query.edit_message_text(
             "✅ Report interface closed.\n"
             "Use /start to access the main menu.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data="start_menu")]])
+            reply_markup=MAIN_MENU_MARKUP
         )
     
     async def handle_start_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Go back to start menu"""
         await self.start(update, context)
     
+    @admin_only
     async def reset_quizzes_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /reset command to delete all quizzes"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         if not context.args or context.args[0].lower() != 'confirm':
             await update.message.reply_text(
                 "⚠️ **Danger: Reset All Quizzes** ⚠️\n\n"
@@ -1107,15 +1630,15 @@ class QuizBot:
         
         # Delete all quizzes
         deleted_count = len(self.quizzes)
-        self.mongo.delete_many('quizzes', {})
+        await self.mongo.delete_many('quizzes', {})
         
         # Reset quizzes list
-        self.quizzes = []
-        self.recently_sent_quizzes = []  # Clear recent tracking
+        self.quizzes = {}
+        self.recently_sent_quizzes.clear()  # Clear recent tracking
+        self.recent_quiz_ids.clear()
         
         # Reset quiz stats
-        self.stats['quizzes_added'] = 0
-        self.save_stats()
+        await self.update_stats(fields={'quizzes_added': 0})
         
         await update.message.reply_text(
             f"✅ **All Quizzes Reset!**\n\n"
@@ -1124,19 +1647,10 @@ class QuizBot:
             f"Use /start to add new quizzes!"
         )
     
+    @admin_only
     async def reset_quizzes_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Reset quizzes from callback menu"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.callback_query.answer("This command is for admin only.")
-            return
-        
-        keyboard = [
-            [InlineKeyboardButton("✅ Confirm Reset", callback_data="confirm_reset")],
-            [InlineKeyboardButton("❌ Cancel", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = RESET_CONFIRM_MARKUP
         
         await update.callback_query.edit_message_text(
             f"⚠️ **Danger: Reset All Quizzes** ⚠️\n\n"
@@ -1148,42 +1662,32 @@ class QuizBot:
             reply_markup=reply_markup
         )
     
+    @admin_only
     async def confirm_reset_quizzes(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Confirm and execute quiz reset"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.callback_query.answer("This command is for admin only.")
-            return
-        
         # Delete all quizzes
         deleted_count = len(self.quizzes)
-        self.mongo.delete_many('quizzes', {})
+        await self.mongo.delete_many('quizzes', {})
         
         # Reset quizzes list
-        self.quizzes = []
-        self.recently_sent_quizzes = []  # Clear recent tracking
+        self.quizzes = {}
+        self.recently_sent_quizzes.clear()  # Clear recent tracking
+        self.recent_quiz_ids.clear()
         
         # Reset quiz stats
-        self.stats['quizzes_added'] = 0
-        self.save_stats()
+        await self.update_stats(fields={'quizzes_added': 0})
         
         await update.callback_query.edit_message_text(
             f"✅ **All Quizzes Reset Successfully!**\n\n"
             f"🗑️ Deleted {deleted_count} quizzes\n"
             f"📝 Quiz database is now empty\n\n"
             f"Use the menu below to add new quizzes!",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📝 Add Quiz", callback_data="add_quiz")]])
+            reply_markup=ADD_QUIZ_MARKUP
         )
     
+    @admin_only
     async def set_explanation_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /setexplanation command"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         if not context.args:
             current_explanation = self.settings.get('quiz_explanation', "Check back later for results!")
             await update.message.reply_text(
@@ -1198,7 +1702,7 @@ class QuizBot:
         
         # Update settings
         self.settings['quiz_explanation'] = new_explanation
-        self.save_settings()
+        await self.save_settings()
         
         await update.message.reply_text(
             f"✅ **Quiz Explanation Updated!**\n\n"
@@ -1206,14 +1710,9 @@ class QuizBot:
             f"This will be used in all future quiz polls."
         )
     
+    @admin_only
     async def set_explanation_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Set explanation from callback (settings menu)"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.callback_query.answer("This command is for admin only.")
-            return
-        
         current_explanation = self.settings.get('quiz_explanation', "Check back later for results!")
         
         await update.callback_query.edit_message_text(
@@ -1237,7 +1736,7 @@ class QuizBot:
         
         # Update settings
         self.settings['quiz_explanation'] = new_explanation
-        self.save_settings()
+        await self.save_settings()
         
         context.user_data['waiting_for_explanation'] = False
         
@@ -1247,14 +1746,9 @@ class QuizBot:
             f"This will be used in all future quiz polls."
         )
     
+    @admin_only
     async def show_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show detailed bot statistics"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         total_quizzes = len(self.quizzes)
         total_groups = len(self.groups)
         total_quizzes_sent = self.stats['total_quizzes_sent']
@@ -1262,27 +1756,26 @@ class QuizBot:
         manual_quizzes_sent = self.stats.get('manual_quizzes_sent', 0)
         quiz_reports_received = self.stats.get('quiz_reports_received', 0)
         quizzes_deleted_by_reports = self.stats.get('quizzes_deleted_by_reports', 0)
-        
-        active_groups_count = len([g for g in self.groups if g.get('is_active', True)])
-        
-        # Calculate active groups (active in last 7 days)
-        week_ago = datetime.now() - timedelta(days=7)
-        recently_active = len([
-            g for g in self.groups 
-            if datetime.fromisoformat(g['last_activity']) > week_ago and g.get('is_active', True)
-        ])
+        active_groups_count = self.active_group_count
+        
+        # Groups active in the last 7 days (ISO timestamps compare correctly as strings)
+        week_ago_iso = (datetime.now() - timedelta(days=7)).isoformat()
+        total_engagement, recently_active, pending_reports, resolved_reports = await asyncio.gather(
+            self.get_total_engagement(),
+            self.mongo.count_documents('groups', {'is_active': True, 'last_activity': {'$gt': week_ago_iso}}),
+            self.mongo.count_documents('quiz_reports', {'status': 'pending'}),
+            self.mongo.count_documents('quiz_reports', {'status': {'$ne': 'pending'}})
+        )
         
         # Most popular quiz
-        most_sent = max(self.quizzes, key=lambda x: x.get('sent_count', 0)) if self.quizzes else None
-        
-        quiz_interval_hours = self.quiz_interval / 3600
+        most_sent_count = max((q.get('sent_count', 0) for q in self.quizzes.values()), default=0)
         
         stats_text = (
             f"📊 **Detailed Bot Statistics**\n\n"
             f"📝 **Quizzes Database**\n"
             f"   • Total quizzes: {total_quizzes}\n"
             f"   • Quizzes added: {quizzes_added}\n"
-            f"   • Most sent quiz: {most_sent['sent_count'] if most_sent else 0} times\n"
+            f"   • Most sent quiz: {most_sent_count} times\n"
             f"   • Quizzes deleted by reports: {quizzes_deleted_by_reports}\n\n"
             
             f"👥 **Groups Analytics**\n"
@@ -1294,56 +1787,42 @@ class QuizBot:
             
             f"⚠️ **Quiz Reports**\n"
             f"   • Reports received: {quiz_reports_received}\n"
-            f"   • Pending reports: {len(self.mongo.find('quiz_reports', {'status': 'pending'}))}\n"
-            f"   • Resolved reports: {len(self.mongo.find('quiz_reports', {'status': {'$ne': 'pending'}}))}\n\n"
+            f"   • Pending reports: {pending_reports}\n"
+            f"   • Resolved reports: {resolved_reports}\n\n"
             
             f"⏰ **Performance**\n"
-            f"   • Bot started: {datetime.fromisoformat(self.stats['bot_start_time']).strftime('%Y-%m-%d %H:%M')}\n"
-            f"   • Last quiz sent: {datetime.fromisoformat(self.stats['last_quiz_sent']).strftime('%Y-%m-%d %H:%M') if self.stats['last_quiz_sent'] else 'Never'}\n"
-            f"   • Quiz interval: {quiz_interval_hours} hours\n"
-            f"   • Next quiz in: ~{quiz_interval_hours} hours\n\n"
+            f"   • Bot started: {format_iso_time(self.stats['bot_start_time'], '%Y-%m-%d %H:%M')}\n"
+            f"   • Last quiz sent: {format_iso_time(self.stats['last_quiz_sent'], '%Y-%m-%d %H:%M') if self.stats['last_quiz_sent'] else 'Never'}\n"
+            f"   • Quiz interval: {self.quiz_interval_hours} hours\n"
+            f"   • Next quiz in: ~{self.quiz_interval_hours} hours\n\n"
             
             f"📈 **Engagement**\n"
             f"   • Avg quizzes per group: {total_quizzes_sent/total_groups if total_groups > 0 else 0:.1f}\n"
-            f"   • Total engagement score: {sum(self.stats['group_engagement'].values())}\n"
+            f"   • Total engagement score: {total_engagement}\n"
         )
         
-        keyboard = [
-            [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
-            [InlineKeyboardButton("📋 Export Data", callback_data="export_data")],
-            [InlineKeyboardButton("🔄 Refresh", callback_data="stats")],
-            [InlineKeyboardButton("📢 Broadcast", callback_data="broadcast")],
-            [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")],
-            [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = STATS_MENU_MARKUP
         
         if update.callback_query:
             await update.callback_query.edit_message_text(stats_text, reply_markup=reply_markup)
         else:
             await update.message.reply_text(stats_text, reply_markup=reply_markup)
     
+    @admin_only
     async def show_settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show bot settings"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
-        quiz_interval_hours = self.quiz_interval / 3600
         current_explanation = self.settings.get('quiz_explanation', "Check back later for results!")
         
         settings_text = (
             f"⚙️ **Bot Settings**\n\n"
-            f"🕐 **Quiz Interval**: {quiz_interval_hours} hours\n"
+            f"🕐 **Quiz Interval**: {self.quiz_interval_hours} hours\n"
             f"   - Current delay between random quizzes\n\n"
             f"📝 **Quiz Explanation**:\n`{current_explanation}`\n"
             f"   - Text shown in quiz polls\n\n"
             f"📊 **Database**: {'MongoDB' if self.mongo.is_connected() else 'In-Memory'}\n"
             f"   - Data persistence status\n\n"
-            f"👥 **Active Groups**: {len([g for g in self.groups if g.get('is_active', True)])}\n"
-            f"📝 **Active Quizzes**: {len([q for q in self.quizzes if q.get('is_active', True)])}\n"
+            f"👥 **Active Groups**: {self.active_group_count}\n"
+            f"📝 **Active Quizzes**: {len([q for q in self.quizzes.values() if q.get('is_active', True)])}\n"
             f"🎯 **Manual Quizzes Sent**: {self.stats.get('manual_quizzes_sent', 0)}\n"
             f"⚠️ **Quiz Reports**: {self.stats.get('quiz_reports_received', 0)}\n\n"
             f"💡 Use /setdelay <time> to change the quiz interval\n"
@@ -1352,30 +1831,23 @@ class QuizBot:
             f"⚠️ Users can report quizzes with /qreport"
         )
         
-        keyboard = [
-            [InlineKeyboardButton("🕐 Set Quiz Interval", callback_data="set_interval")],
-            [InlineKeyboardButton("📝 Set Explanation", callback_data="set_explanation")],
-            [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
-            [InlineKeyboardButton("🔄 Refresh Groups", callback_data="refresh_groups")],
-            [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
-            [InlineKeyboardButton("⚠️ View Reports", callback_data="view_reports")],
-            [InlineKeyboardButton("🔄 Reset Quizzes", callback_data="reset_quizzes")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = SETTINGS_MENU_MARKUP
         
         if update.callback_query:
             await update.callback_query.edit_message_text(settings_text, reply_markup=reply_markup)
         else:
             await update.message.reply_text(settings_text, reply_markup=reply_markup)
     
+    async def set_quiz_interval(self, seconds):
+        """Change the quiz interval and persist it"""
+        self.quiz_interval = seconds
+        self.quiz_interval_hours = seconds / 3600
+        self.settings['quiz_interval'] = seconds
+        await self.save_settings()
+    
+    @admin_only
     async def set_quiz_interval_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /setdelay command directly"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         if not context.args:
             await update.message.reply_text(
                 "❌ Please specify the interval.\n\n"
@@ -1386,7 +1858,7 @@ class QuizBot:
                 "• `/setdelay 1.5h` - 1.5 hours\n"
                 "• `/setdelay 90m` - 90 minutes\n"
                 "• `/setdelay 2` - 2 hours (default)\n\n"
-                f"**Current interval:** {self.quiz_interval / 3600} hours"
+                f"**Current interval:** {self.quiz_interval_hours} hours"
             )
             return
         
@@ -1402,7 +1874,7 @@ class QuizBot:
                 "• `1.5h` - 1.5 hours\n"
                 "• `90m` - 90 minutes\n"
                 "• `2` - 2 hours (default)\n\n"
-                f"**Current interval:** {self.quiz_interval / 3600} hours"
+                f"**Current interval:** {self.quiz_interval_hours} hours"
             )
             return
         
@@ -1411,9 +1883,7 @@ class QuizBot:
             return
         
         old_interval = self.quiz_interval
-        self.quiz_interval = new_interval
-        self.settings['quiz_interval'] = new_interval
-        self.save_settings()
+        await self.set_quiz_interval(new_interval)
         
         # Format display
         if new_interval < 60:
@@ -1432,14 +1902,9 @@ class QuizBot:
             f"Next quiz will be sent in approximately {display_time}."
         )
     
+    @admin_only
     async def set_quiz_interval_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Set quiz interval from callback (settings menu)"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.callback_query.answer("This command is for admin only.")
-            return
-        
         await update.callback_query.edit_message_text(
             "🕐 **Set Quiz Interval**\n\n"
             "Please send the new interval.\n\n"
@@ -1449,7 +1914,7 @@ class QuizBot:
             "• `1.5h` - 1.5 hours\n"
             "• `90m` - 90 minutes\n"
             "• `2` - 2 hours (default)\n\n"
-            "Current interval: {} hours".format(self.quiz_interval / 3600)
+            "Current interval: {} hours".format(self.quiz_interval_hours)
         )
         
         # Set a flag to expect interval input
@@ -1474,7 +1939,7 @@ class QuizBot:
                 "• `1.5h` - 1.5 hours\n"
                 "• `90m` - 90 minutes\n"
                 "• `2` - 2 hours (default)\n\n"
-                f"**Current interval:** {self.quiz_interval / 3600} hours"
+                f"**Current interval:** {self.quiz_interval_hours} hours"
             )
             return
         
@@ -1483,9 +1948,7 @@ class QuizBot:
             return
         
         old_interval = self.quiz_interval
-        self.quiz_interval = new_interval
-        self.settings['quiz_interval'] = new_interval
-        self.save_settings()
+        await self.set_quiz_interval(new_interval)
         
         context.user_data['waiting_for_interval'] = False
         
@@ -1506,20 +1969,16 @@ class QuizBot:
             f"Next quiz will be sent in approximately {display_time}."
         )
     
+    @admin_only
     async def start_broadcast(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start broadcast mode"""
         user_id = update.effective_user.id
         
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         self.broadcast_mode[user_id] = True
         
-        keyboard = [[InlineKeyboardButton("❌ Cancel Broadcast", callback_data="cancel_broadcast")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = CANCEL_BROADCAST_MARKUP
         
-        active_groups = len([g for g in self.groups if g.get('is_active', True)])
+        active_groups = self.active_group_count
         
         message = (
             f"📢 **Broadcast Mode Activated**\n\n"
@@ -1538,32 +1997,35 @@ class QuizBot:
         user_id = update.effective_user.id
         self.broadcast_mode[user_id] = False
         
-        active_groups = [g for g in self.groups if g.get('is_active', True)]
+        active_groups = [g for g in self.groups.values() if g.get('is_active', True)]
         sent_to = 0
         failed_groups = []
+        failed_ids = []
+        failed_chat_ids = []
+        text = f"📢 **Announcement**\n\n{message_text}\n\n- Admin"
         
-        # Send to all active groups
-        for group in active_groups:
-            try:
-                await self.application.bot.send_message(
-                    chat_id=group['chat_id'],
-                    text=f"📢 **Announcement**\n\n{message_text}\n\n- Admin"
-                )
+        results = await self.gather_limited(
+            active_groups,
+            lambda group: self.application.bot.send_message(chat_id=group['chat_id'], text=text)
+        )
+        
+        for group, result in results:
+            if not isinstance(result, Exception):
                 sent_to += 1
-                await asyncio.sleep(0.5)  # Rate limiting
-            except Exception as e:
+            else:
                 failed_groups.append(group['title'])
-                print(f"Failed to broadcast to {group['title']}: {e}")
+                logger.warning("Failed to broadcast to %s: %s", group['title'], result)
                 # Mark group as inactive
-                group['is_active'] = False
-                self.save_group(group)
+                self.set_group_active(group, False)
+                failed_ids.append(group['_id'])
+                failed_chat_ids.append(group['chat_id'])
         
-        # Update stats
-        self.stats['total_broadcasts_sent'] = self.stats.get('total_broadcasts_sent', 0) + sent_to
-        self.save_stats()
+        if failed_ids:
+            await self.mongo.update_many('groups', {'_id': {'$in': failed_ids}}, {'$set': {'is_active': False}})
+            await self.forget_invite_links(failed_chat_ids)
         
-        # Reload groups after updates
-        self.groups = self.load_groups()
+        # Update stats
+        await self.update_stats({'total_broadcasts_sent': sent_to})
         
         # Send report to admin
         report = (
@@ -1574,123 +2036,111 @@ class QuizBot:
         )
         
         if failed_groups:
-            report += f"\nFailed groups (marked inactive):\n" + "\n".join(failed_groups[:10])
+            report += "\nFailed groups (marked inactive):\n" + "\n".join(failed_groups[:10])
             if len(failed_groups) > 10:
                 report += f"\n... and {len(failed_groups) - 10} more"
         
         await update.message.reply_text(report)
     
+    async def send_export_file(self, context: ContextTypes.DEFAULT_TYPE, chat_id, filename, caption, data):
+        """Upload an export built in memory"""
+        await context.bot.send_document(
+            chat_id=chat_id,
+            document=data,
+            filename=filename,
+            caption=caption
+        )
+    
+    async def export_quizzes(self, context: ContextTypes.DEFAULT_TYPE, chat_id):
+        """Build and send the quizzes CSV, returning the row count"""
+        if not self.quizzes:
+            return 0
+        fieldnames = ['_id', 'type', 'question', 'options', 'is_anonymous', 'allows_multiple_answers', 'correct_option_id', 'added_date', 'sent_count', 'manual_sent_count', 'last_sent', 'is_active']
+        # Convert options list to string for CSV
+        rows = export_rows(list(self.quizzes.values()), fieldnames, options=' | '.join)
+        data = await asyncio.to_thread(csv_bytes, fieldnames, rows)
+        await self.send_export_file(context, chat_id, 'quizzes_export.csv', "📝 Quizzes Export (CSV)", data)
+        return len(self.quizzes)
+    
+    async def export_groups(self, context: ContextTypes.DEFAULT_TYPE, chat_id):
+        """Build and send the groups CSV, returning the row count"""
+        if not self.groups:
+            return 0
+        fieldnames = ['_id', 'chat_id', 'title', 'added_date', 'member_count', 'quizzes_received', 'manual_quizzes_received', 'last_activity', 'is_active']
+        rows = export_rows(list(self.groups.values()), fieldnames)
+        data = await asyncio.to_thread(csv_bytes, fieldnames, rows)
+        await self.send_export_file(context, chat_id, 'groups_export.csv', "👥 Groups Export (CSV)", data)
+        return len(self.groups)
+    
+    async def export_stats(self, context: ContextTypes.DEFAULT_TYPE, chat_id):
+        """Build and send the stats JSON"""
+        data = await asyncio.to_thread(json_bytes, dict(self.stats))
+        await self.send_export_file(context, chat_id, 'stats_export.json', "📊 Statistics Export (JSON)", data)
+    
+    async def export_reports(self, context: ContextTypes.DEFAULT_TYPE, chat_id):
+        """Stream reports from MongoDB into an in-memory CSV and send it, returning the row count"""
+        reports_count = 0
+        fieldnames = ['_id', 'status', 'question', 'options', 'correct_option_id', 'reported_by', 'report_time', 'group_name', 'action_taken', 'action_time']
+        formatters = {'options': ' | '.join, 'reported_by': format_reporter}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fieldnames)
+        batch = []
+        async for report in self.mongo.find_cursor('quiz_reports', {}, dict.fromkeys(fieldnames, 1), EXPORT_BATCH_SIZE):
+            batch.append(report)
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                await asyncio.to_thread(writer.writerows, export_rows(batch, fieldnames, **formatters))
+                reports_count += len(batch)
+                batch = []
+        await asyncio.to_thread(writer.writerows, export_rows(batch, fieldnames, **formatters))
+        reports_count += len(batch)
+        
+        if reports_count:
+            data = buffer.getvalue().encode('utf-8')
+            await self.send_export_file(context, chat_id, 'reports_export.csv', "⚠️ Quiz Reports Export (CSV)", data)
+        return reports_count
+    
+    @admin_only
     async def export_data(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Export bot data to JSON and CSV files"""
         user_id = update.effective_user.id
         
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
-        try:
-            # Export quizzes to CSV
-            if self.quizzes:
-                with open('quizzes_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['_id', 'type', 'question', 'options', 'is_anonymous', 'allows_multiple_answers', 'correct_option_id', 'added_date', 'sent_count', 'manual_sent_count', 'last_sent', 'is_active']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for quiz in self.quizzes:
-                        # Convert options list to string for CSV
-                        quiz_export = quiz.copy()
-                        quiz_export['options'] = ' | '.join(quiz['options'])
-                        writer.writerow(quiz_export)
-                
-                # Send quizzes CSV
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=open('quizzes_export.csv', 'rb'),
-                    filename='quizzes_export.csv',
-                    caption="📝 Quizzes Export (CSV)"
-                )
-            
-            # Export groups to CSV
-            if self.groups:
-                with open('groups_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['_id', 'chat_id', 'title', 'added_date', 'member_count', 'quizzes_received', 'manual_quizzes_received', 'last_activity', 'is_active']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for group in self.groups:
-                        writer.writerow(group)
-                
-                # Send groups CSV
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=open('groups_export.csv', 'rb'),
-                    filename='groups_export.csv',
-                    caption="👥 Groups Export (CSV)"
-                )
-            
-            # Export stats to JSON
-            with open('stats_export.json', 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2, ensure_ascii=False)
-            
-            # Send stats JSON
-            await context.bot.send_document(
-                chat_id=user_id,
-                document=open('stats_export.json', 'rb'),
-                filename='stats_export.json',
-                caption="📊 Statistics Export (JSON)"
-            )
-            
-            # Export reports to CSV
-            reports = self.mongo.find('quiz_reports', {})
-            if reports:
-                with open('reports_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['_id', 'status', 'question', 'options', 'correct_option_id', 'reported_by', 'report_time', 'group_name', 'action_taken', 'action_time']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for report in reports:
-                        report_export = report.copy()
-                        report_export['options'] = ' | '.join(report['options'])
-                        report_export['reported_by'] = f"{report['reported_by']['first_name']} ({report['reported_by']['user_id']})"
-                        writer.writerow(report_export)
-                
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=open('reports_export.csv', 'rb'),
-                    filename='reports_export.csv',
-                    caption="⚠️ Quiz Reports Export (CSV)"
-                )
-            
-            # Send summary
-            summary = (
-                f"✅ **Data Export Completed**\n\n"
-                f"📁 Files exported:\n"
-                f"• quizzes_export.csv ({len(self.quizzes)} quizzes)\n"
-                f"• groups_export.csv ({len(self.groups)} groups)\n"
-                f"• stats_export.json (statistics)\n"
-                f"• reports_export.csv ({len(reports)} reports)\n\n"
-                f"💾 All data has been exported successfully!"
-            )
-            
-            if update.callback_query:
-                await update.callback_query.edit_message_text(summary)
-            else:
-                await update.message.reply_text(summary)
-                
-        except Exception as e:
-            error_msg = f"❌ Error exporting data: {str(e)}"
-            if update.callback_query:
-                await update.callback_query.edit_message_text(error_msg)
+        # Build and upload every file concurrently; one failure doesn't stop the others
+        exports = [
+            ('quizzes_export.csv', "{} quizzes", self.export_quizzes(context, user_id)),
+            ('groups_export.csv', "{} groups", self.export_groups(context, user_id)),
+            ('stats_export.json', "statistics", self.export_stats(context, user_id)),
+            ('reports_export.csv', "{} reports", self.export_reports(context, user_id)),
+        ]
+        results = await asyncio.gather(*(export for _, _, export in exports), return_exceptions=True)
+        
+        file_lines = []
+        failed = 0
+        for (filename, label, _), result in zip(exports, results):
+            if isinstance(result, Exception):
+                failed += 1
+                file_lines.append(f"• ❌ {filename}: {result}\n")
             else:
-                await update.message.reply_text(error_msg)
+                file_lines.append(f"• {filename} ({label.format(result)})\n")
+        
+        # Send summary
+        summary = "".join([
+            "✅ **Data Export Completed**\n\n" if not failed else "⚠️ **Data Export Completed With Errors**\n\n",
+            "📁 Files exported:\n",
+            *file_lines,
+            "\n💾 All data has been exported successfully!" if not failed else f"\n❌ {failed} export(s) failed"
+        ])
+        
+        if update.callback_query:
+            await update.callback_query.edit_message_text(summary)
+        else:
+            await update.message.reply_text(summary)
     
+    @admin_only
     async def manage_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show group management interface"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         total_groups = len(self.groups)
-        active_groups = len([g for g in self.groups if g.get('is_active', True)])
+        active_groups = self.active_group_count
         inactive_groups = total_groups - active_groups
         
         groups_text = (
@@ -1702,223 +2152,248 @@ class QuizBot:
         )
         
         # Show top 5 most active groups
-        active_groups_list = [g for g in self.groups if g.get('is_active', True)]
-        sorted_groups = sorted(active_groups_list, key=lambda x: x.get('quizzes_received', 0), reverse=True)[:5]
+        active_groups_list = self.partition_groups()[0]
+        sorted_groups = heapq.nlargest(5, active_groups_list, key=lambda x: x.get('quizzes_received', 0))
         
         if sorted_groups:
             groups_text += "🏆 **Top 5 Active Groups:**\n"
             for i, group in enumerate(sorted_groups, 1):
                 groups_text += f"{i}. {group['title']} - {group.get('quizzes_received', 0)} auto + {group.get('manual_quizzes_received', 0)} manual quizzes\n"
         
-        keyboard = [
-            [InlineKeyboardButton("🔄 Refresh", callback_data="manage_groups")],
-            [InlineKeyboardButton("📊 Statistics", callback_data="stats")],
-            [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
-            [InlineKeyboardButton("🔄 Reactivate All", callback_data="reactivate_all")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = MANAGE_GROUPS_MARKUP
         
         if update.callback_query:
             await update.callback_query.edit_message_text(groups_text, reply_markup=reply_markup)
         else:
             await update.message.reply_text(groups_text, reply_markup=reply_markup)
     
+    @admin_only
     async def clean_inactive_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Remove inactive groups"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         # Find inactive groups
-        inactive_groups = [g for g in self.groups if not g.get('is_active', True)]
+        active_groups, inactive_groups = self.partition_groups()
         
         if not inactive_groups:
             await update.callback_query.answer("No inactive groups found!")
             return
         
-        # Remove inactive groups from MongoDB
+        # Remove inactive groups from MongoDB in one call
+        await self.mongo.delete_many('groups', {'_id': {'$in': [g['_id'] for g in inactive_groups]}})
         for group in inactive_groups:
-            self.mongo.delete_one('groups', {'_id': group['_id']})
-        
-        # Reload groups
-        self.groups = self.load_groups()
+            self.groups.pop(group['chat_id'], None)
         
         await update.callback_query.edit_message_text(
             f"✅ **Cleaned {len(inactive_groups)} inactive groups**\n\n"
             f"Removed groups that were marked as inactive (likely removed the bot).\n"
-            f"Current active groups: {len([g for g in self.groups if g.get('is_active', True)])}"
+            f"Current active groups: {len(active_groups)}"
         )
     
+    @admin_only
     async def reactivate_all_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Reactivate all groups"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
-            return
-        
         # Reactivate all groups
-        for group in self.groups:
+        await self.mongo.update_many('groups', {}, {'$set': {'is_active': True}})
+        for group in self.groups.values():
             group['is_active'] = True
-            self.save_group(group)
-        
-        # Reload groups
-        self.groups = self.load_groups()
+        self.active_group_count = len(self.groups)
         
         await update.callback_query.edit_message_text(
             f"✅ **All groups reactivated!**\n\n"
             f"All {len(self.groups)} groups have been marked as active and will receive quizzes."
         )
     
+    @admin_only
     async def refresh_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Refresh groups list"""
-        user_id = update.effective_user.id
+        # Reload groups from MongoDB and drop cached invite links
+        await self.reload_groups()
+        await self.mongo.delete_many('invite_links', {})
+        self.invite_links = {}
         
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("This command is for admin only.")
+        active_groups = self.active_group_count
+        
+        await update.callback_query.answer(f"Groups refreshed! {active_groups} active groups loaded.")
+    
+    async def load_invite_links(self):
+        """Map chat_id to invite links that haven't expired yet"""
+        now = datetime.utcnow()
+        if self.invite_links is None:
+            links = await self.mongo.find('invite_links', {'expires_at': {'$gt': now}})
+            self.invite_links = {link['_id']: (link['invite_link'], link['expires_at']) for link in links}
+        
+        return {
+            chat_id: invite_link
+            for chat_id, (invite_link, expires_at) in self.invite_links.items()
+            if expires_at > now
+        }
+    
+    async def forget_invite_links(self, chat_ids):
+        """Drop cached invite links for groups that were deactivated or removed"""
+        if not chat_ids:
             return
         
-        # Reload groups from MongoDB
-        self.groups = self.load_groups()
+        if self.invite_links is not None:
+            for chat_id in chat_ids:
+                self.invite_links.pop(chat_id, None)
+        await self.mongo.delete_many('invite_links', {'_id': {'$in': list(chat_ids)}})
+    
+    async def fetch_invite_link(self, bot, chat_id, cached_links):
+        """Reuse a cached invite link or create one (requires bot to have admin permissions)
         
-        active_groups = len([g for g in self.groups if g.get('is_active', True)])
+        Raises Forbidden/BadRequest if the bot is no longer in the chat, cached link or not."""
+        if chat_id in cached_links:
+            # Cheap liveness probe so groups that removed the bot are still detected
+            await bot.get_chat(chat_id)
+            return cached_links[chat_id]
         
-        await update.callback_query.answer(f"Groups refreshed! {active_groups} active groups loaded.")
+        invite_link_obj = await bot.create_chat_invite_link(
+            chat_id=chat_id,
+            expire_date=datetime.now() + timedelta(days=INVITE_LINK_DAYS)
+        )
+        invite_link = invite_link_obj.invite_link
+        
+        # Expire the cached copy a minute before Telegram does
+        expires_at = datetime.utcnow() + timedelta(days=INVITE_LINK_DAYS, minutes=-1)
+        if self.invite_links is not None:
+            self.invite_links[chat_id] = (invite_link, expires_at)
+        await self.mongo.update_one(
+            'invite_links',
+            {'_id': chat_id},
+            {'$set': {'invite_link': invite_link, 'expires_at': expires_at}},
+            upsert=True
+        )
+        return invite_link
     
+    @admin_only
     async def list_groups_with_links(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /grouplist command - list all groups with invite links"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("❌ This command is for admin only.")
-            return
-        
         if not self.groups:
             await update.message.reply_text("❌ No groups found in database.")
             return
         
-        active_groups = [g for g in self.groups if g.get('is_active', True)]
-        inactive_groups = [g for g in self.groups if not g.get('is_active', True)]
-        
-        # Show loading message
-        loading_msg = await update.message.reply_text("🔄 Fetching group links... This may take a moment.")
+        # Only one list per admin at a time
+        lock = self.group_list_locks.setdefault(update.effective_user.id, asyncio.Lock())
+        if lock.locked():
+            await update.message.reply_text("⏳ Your group list is still being prepared...")
+            return
+        await lock.acquire()
         
-        groups_text = f"👥 **Groups List ({len(self.groups)} total)**\n\n"
-        groups_text += f"🟢 Active: {len(active_groups)}\n"
-        groups_text += f"🔴 Inactive: {len(inactive_groups)}\n\n"
+        # Show loading message; release the lock ourselves if this fails before the task owns it
+        try:
+            loading_msg = await update.message.reply_text("🔄 Fetching group links... I'll send the list when it's ready.")
+        except Exception:
+            lock.release()
+            raise
+        
+        # Build the list in the background so other updates keep being handled
+        task = asyncio.create_task(self.send_group_list(update, context, loading_msg, lock))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+    
+    async def send_group_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, loading_msg, lock):
+        """Background wrapper for build_group_list that always releases the admin's lock"""
+        try:
+            await self.build_group_list(update, context, loading_msg)
+        except Exception as e:
+            logger.error("Error building group list: %s", e)
+            await update.message.reply_text(f"❌ Error building group list: {e}")
+        finally:
+            lock.release()
+    
+    async def build_group_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, loading_msg):
+        """Fetch invite links for every group and send the summary and detailed list"""
+        active_groups, inactive_groups = self.partition_groups()
         
-        all_links_text = "📋 **Group List with Links**\n\n"
+        link_parts = ["📋 **Group List with Links**\n\n"]
         failed_groups = []
         success_count = 0
         
-        # Process groups in batches to avoid rate limiting
-        for i, group in enumerate(self.groups, 1):
+        cached_links = await self.load_invite_links()
+        results = await self.gather_limited(
+            self.groups.values(),
+            lambda group: self.fetch_invite_link(context.bot, group['chat_id'], cached_links)
+        )
+        inaccessible_ids = []
+        inaccessible_chat_ids = []
+        
+        for i, (group, invite_link) in enumerate(results, 1):
+            if isinstance(invite_link, Forbidden):
+                # Bot was removed from the group
+                accessible = False
+            elif isinstance(invite_link, BadRequest):
+                accessible = 'chat not found' not in invite_link.message.lower()
+            else:
+                accessible = True
+            if isinstance(invite_link, Exception):
+                invite_link = None
+            
             chat_id = group['chat_id']
             group_title = group.get('title', f"Group {chat_id}")
             status = "🟢" if group.get('is_active', True) else "🔴"
             
-            try:
-                # Try to get invite link (requires bot to have admin permissions)
-                chat = await context.bot.get_chat(chat_id)
-                
-                try:
-                    # Try to create invite link
-                    invite_link_obj = await context.bot.create_chat_invite_link(
-                        chat_id=chat_id,
-                        member_limit=1,
-                        expire_date=datetime.now() + timedelta(days=7)
-                    )
-                    invite_link = invite_link_obj.invite_link
-                    link_text = f"[Join {group_title}]({invite_link})"
-                except Exception as link_error:
-                    # If can't create link, try to export existing link
-                    try:
-                        invite_link = await context.bot.export_chat_invite_link(chat_id)
-                        link_text = f"[Join {group_title}]({invite_link})"
-                    except Exception as export_error:
-                        link_text = "❌ No invite link (bot needs admin)"
-                        invite_link = None
+            if accessible:
+                link_text = f"[Join {group_title}]({invite_link})" if invite_link else "❌ No invite link (bot needs admin)"
                 
                 # Add to detailed list
-                all_links_text += f"{i}. {status} **{group_title}**\n"
-                all_links_text += f"   • ID: `{chat_id}`\n"
-                all_links_text += f"   • Link: {link_text}\n"
-                all_links_text += f"   • Auto Quizzes: {group.get('quizzes_received', 0)}\n"
-                all_links_text += f"   • Manual Quizzes: {group.get('manual_quizzes_received', 0)}\n"
+                link_parts.append(GROUP_LINK_ROW(
+                    i, status, group_title, chat_id, link_text,
+                    group.get('quizzes_received', 0), group.get('manual_quizzes_received', 0)
+                ))
                 
                 if invite_link:
                     success_count += 1
-                
-                all_links_text += "\n"
-                
-                # Add to summary text
-                groups_text += f"{i}. {status} **{group_title}**\n"
-                if invite_link:
-                    groups_text += f"   🔗 {invite_link}\n"
-                groups_text += f"   📊 Auto: {group.get('quizzes_received', 0)} | Manual: {group.get('manual_quizzes_received', 0)}\n\n"
-                
-            except Exception as e:
+            else:
                 # Group not accessible or bot removed
                 failed_groups.append(group_title)
-                all_links_text += f"{i}. 🔴 **{group_title}** (❌ Bot not in group)\n"
-                all_links_text += f"   • ID: `{chat_id}`\n"
-                all_links_text += f"   • Last active: {group.get('last_activity', 'Never')[:10]}\n\n"
-                
-                groups_text += f"{i}. 🔴 **{group_title}** (Bot removed)\n\n"
+                link_parts.append(GROUP_GONE_ROW(i, group_title, chat_id, group.get('last_activity', 'Never')))
                 
                 # Mark as inactive
-                group['is_active'] = False
-                self.save_group(group)
-            
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
+                self.set_group_active(group, False)
+                inaccessible_ids.append(group['_id'])
+                inaccessible_chat_ids.append(chat_id)
+        
+        if inaccessible_ids:
+            await self.mongo.update_many('groups', {'_id': {'$in': inaccessible_ids}}, {'$set': {'is_active': False}})
+            await self.forget_invite_links(inaccessible_chat_ids)
         
-        # Reload groups after updates
-        self.groups = self.load_groups()
+        all_links_text = "".join(link_parts)
         
         # Update loading message with summary
         await loading_msg.delete()
         
         # Send summary first
-        summary_text = (
+        summary_parts = [
             f"📊 **Groups Summary**\n\n"
             f"✅ Successfully fetched links: {success_count}/{len(self.groups)}\n"
             f"❌ Failed/Inaccessible: {len(failed_groups)}\n"
             f"🟢 Active groups: {len(active_groups)}\n"
             f"🔴 Inactive groups: {len(inactive_groups)}\n\n"
-        )
+        ]
         
         if failed_groups:
-            summary_text += "❌ **Failed Groups (Bot not in group):**\n"
-            for group in failed_groups[:5]:  # Show only first 5
-                summary_text += f"• {group}\n"
+            summary_parts.append("❌ **Failed Groups (Bot not in group):**\n")
+            summary_parts.extend(f"• {group}\n" for group in failed_groups[:5])  # Show only first 5
             if len(failed_groups) > 5:
-                summary_text += f"... and {len(failed_groups) - 5} more\n"
-            summary_text += "\n"
+                summary_parts.append(f"... and {len(failed_groups) - 5} more\n")
+            summary_parts.append("\n")
         
         # Add instructions
-        summary_text += (
+        summary_parts.append(
             "📝 **Note:** Links expire in 7 days\n"
             "🔄 Use /refreshgroups to update group status\n"
             "🗑️ Inactive groups are automatically cleaned"
         )
+        summary_text = "".join(summary_parts)
         
         # Create inline keyboard for navigation
-        keyboard = [
-            [InlineKeyboardButton("🔄 Refresh List", callback_data="refresh_groups")],
-            [InlineKeyboardButton("🗑️ Clean Inactive", callback_data="clean_inactive")],
-            [InlineKeyboardButton("📊 All Group Stats", callback_data="manage_groups")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = GROUP_LIST_MARKUP
         
         await update.message.reply_text(summary_text, reply_markup=reply_markup)
         
         # Check if detailed list is too long for Telegram
-        if len(all_links_text) > 4000:
+        chunks = split_message(all_links_text)
+        if len(chunks) > 1:
             # Split into multiple messages
-            chunks = [all_links_text[i:i+4000] for i in range(0, len(all_links_text), 4000)]
             for i, chunk in enumerate(chunks[:3]):  # Send max 3 chunks
                 if i == 0:
                     await update.message.reply_text(chunk, parse_mode='Markdown')
@@ -1932,45 +2407,43 @@ class QuizBot:
             # Send complete list
             await update.message.reply_text(all_links_text, parse_mode='Markdown')
     
+    @admin_only
     async def quick_groups_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /groups command - quick list of groups without links"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("❌ This command is for admin only.")
-            return
-        
         if not self.groups:
             await update.message.reply_text("❌ No groups found in database.")
             return
         
-        active_groups = [g for g in self.groups if g.get('is_active', True)]
-        inactive_groups = [g for g in self.groups if not g.get('is_active', True)]
+        active_groups, inactive_groups = self.partition_groups()
         
-        groups_text = f"👥 **Groups Summary ({len(self.groups)} total)**\n\n"
+        groups_parts = [f"👥 **Groups Summary ({len(self.groups)} total)**\n\n"]
         
         if active_groups:
-            groups_text += f"🟢 **Active Groups ({len(active_groups)})**\n"
-            for i, group in enumerate(active_groups[:20], 1):  # Show only first 20
-                groups_text += f"{i}. {group.get('title', 'Unknown')} (ID: `{group['chat_id']}`)\n"
-                groups_text += f"   📊 Auto: {group.get('quizzes_received', 0)} | Manual: {group.get('manual_quizzes_received', 0)}\n"
+            groups_parts.append(f"🟢 **Active Groups ({len(active_groups)})**\n")
+            groups_parts.extend(
+                ACTIVE_GROUP_ROW(
+                    i, group.get('title', 'Unknown'), group['chat_id'],
+                    group.get('quizzes_received', 0), group.get('manual_quizzes_received', 0)
+                )
+                for i, group in enumerate(active_groups[:20], 1)  # Show only first 20
+            )
             
             if len(active_groups) > 20:
-                groups_text += f"... and {len(active_groups) - 20} more\n"
+                groups_parts.append(f"... and {len(active_groups) - 20} more\n")
             
-            groups_text += "\n"
+            groups_parts.append("\n")
         
         if inactive_groups:
-            groups_text += f"🔴 **Inactive Groups ({len(inactive_groups)})**\n"
+            groups_parts.append(f"🔴 **Inactive Groups ({len(inactive_groups)})**\n")
             for i, group in enumerate(inactive_groups[:10], 1):  # Show only first 10
-                groups_text += f"{i}. {group.get('title', 'Unknown')} (ID: `{group['chat_id']}`)\n"
+                groups_parts.append(f"{i}. {group.get('title', 'Unknown')} (ID: `{group['chat_id']}`)\n")
             
             if len(inactive_groups) > 10:
-                groups_text += f"... and {len(inactive_groups) - 10} more\n"
+                groups_parts.append(f"... and {len(inactive_groups) - 10} more\n")
             
-            groups_text += "\n"
+            groups_parts.append("\n")
         
-        groups_text += (
+        groups_parts.append(
             f"📊 **Stats:**\n"
             f"• Total quizzes sent to all groups: {self.stats.get('total_quizzes_sent', 0)}\n"
             f"• Manual quizzes sent: {self.stats.get('manual_quizzes_sent', 0)}\n"
@@ -1978,63 +2451,45 @@ class QuizBot:
             f"💡 Use `/grouplist` for detailed list with invite links\n"
             f"💡 Use `/grouplinks` for only links (export format)"
         )
+        groups_text = "".join(groups_parts)
         
-        keyboard = [
-            [InlineKeyboardButton("🔗 Get Links", callback_data="get_group_links")],
-            [InlineKeyboardButton("🔄 Refresh", callback_data="manage_groups")],
-            [InlineKeyboardButton("📊 Full Stats", callback_data="stats")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = QUICK_GROUPS_MARKUP
         
         await update.message.reply_text(groups_text, reply_markup=reply_markup)
     
+    @admin_only
     async def export_group_links(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /grouplinks command - export group links in simple format"""
-        user_id = update.effective_user.id
-        
-        if user_id != ADMIN_USER_ID:
-            await update.message.reply_text("❌ This command is for admin only.")
-            return
-        
         if not self.groups:
             await update.message.reply_text("❌ No groups found in database.")
             return
         
         loading_msg = await update.message.reply_text("🔄 Generating group links...")
         
-        links_text = "🔗 **Group Invite Links**\n\n"
-        links_only = "📋 **Links Only (for export):**\n\n"
+        link_parts = ["🔗 **Group Invite Links**\n\n"]
+        links_only_parts = ["📋 **Links Only (for export):**\n\n"]
         
         success_count = 0
         
-        for group in self.groups:
-            if not group.get('is_active', True):
-                continue
-                
-            chat_id = group['chat_id']
-            group_title = group.get('title', f"Group {chat_id}")
+        cached_links = await self.load_invite_links()
+        active_groups = [g for g in self.groups.values() if g.get('is_active', True)]
+        results = await self.gather_limited(
+            active_groups,
+            lambda group: self.fetch_invite_link(context.bot, group['chat_id'], cached_links)
+        )
+        
+        for group, invite_link in results:
+            group_title = group.get('title', f"Group {group['chat_id']}")
             
-            try:
-                # Try to create invite link
-                try:
-                    invite_link_obj = await context.bot.create_chat_invite_link(
-                        chat_id=chat_id,
-                        member_limit=1,
-                        expire_date=datetime.now() + timedelta(days=7)
-                    )
-                    invite_link = invite_link_obj.invite_link
-                except:
-                    # Try to export existing link
-                    invite_link = await context.bot.export_chat_invite_link(chat_id)
-                
-                links_text += f"• **{group_title}**\n{invite_link}\n\n"
-                links_only += f"{invite_link}\n"
+            if invite_link and not isinstance(invite_link, Exception):
+                link_parts.append(f"• **{group_title}**\n{invite_link}\n\n")
+                links_only_parts.append(f"{invite_link}\n")
                 success_count += 1
-                
-            except Exception as e:
-                links_text += f"• **{group_title}** - ❌ No link available\n\n"
-            
-            await asyncio.sleep(0.1)
+            else:
+                link_parts.append(f"• **{group_title}** - ❌ No link available\n\n")
+        
+        links_text = "".join(link_parts)
+        links_only = "".join(links_only_parts)
         
         await loading_msg.delete()
         
@@ -2049,24 +2504,24 @@ class QuizBot:
         
         await update.message.reply_text(summary)
         
-        # Send links text (might be long)
+        # Send links text, as one file if it doesn't fit in a message
         if len(links_text) > 4000:
-            chunks = [links_text[i:i+4000] for i in range(0, len(links_text), 4000)]
-            for chunk in chunks[:3]:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
-                await asyncio.sleep(0.5)
+            await context.bot.send_document(
+                chat_id=update.effective_chat.id,
+                document=links_text.encode('utf-8'),
+                filename='group_links_detailed.txt',
+                caption="🔗 Group invite links (text file)"
+            )
         else:
             await update.message.reply_text(links_text, parse_mode='Markdown')
         
         # Send links-only section
         await update.message.reply_text("📋 **Copy-paste section:**")
         if len(links_only) > 4000:
-            # Save to file if too long
-            with open('group_links.txt', 'w', encoding='utf-8') as f:
-                f.write(links_only)
+            # Send as a text file if too long
             await context.bot.send_document(
                 chat_id=update.effective_chat.id,
-                document=open('group_links.txt', 'rb'),
+                document=links_only.encode('utf-8'),
                 filename='group_links.txt',
                 caption="📋 Group links (text file)"
             )
@@ -2080,117 +2535,77 @@ class QuizBot:
         
         data = query.data
         
-        if data == "stats":
-            await self.show_stats(update, context)
-        elif data == "add_quiz":
-            await query.edit_message_text(
-                "📝 **Add New Quiz Poll**\n\n"
-                "To add a quiz:\n\n"
-                "1. Click the 📎 attachment icon\n"
-                "2. Select 'Poll'\n"
-                "3. Enter your question and options\n"
-                "4. ✅ **Enable 'Quiz Mode' and set the correct answer**\n"
-                "5. Send the poll to me\n\n"
-                "📢 **Important:** I only accept QUIZ MODE polls (with correct answers)\n"
-                "📢 **Important:** I accept both anonymous and non-anonymous QUIZ MODE polls\n"
-                "📢 **Important:** When sent to groups, quizzes will ALWAYS be NON-ANONYMOUS (voters visible)\n\n"
-                "I'll automatically save it and send it to groups!\n\n"
-                "💡 Group admins can use /rquiz for immediate quizzes\n"
-                "⚠️ Users can report quizzes with /qreport"
-            )
-        elif data == "settings":
-            await self.show_settings(update, context)
-        elif data == "broadcast":
-            await self.start_broadcast(update, context)
-        elif data == "manage_groups":
-            await self.manage_groups(update, context)
-        elif data == "export_data":
-            await self.export_data(update, context)
-        elif data == "reset_quizzes":
-            await self.reset_quizzes_callback(update, context)
-        elif data == "confirm_reset":
-            await self.confirm_reset_quizzes(update, context)
-        elif data == "set_interval":
-            await self.set_quiz_interval_callback(update, context)
-        elif data == "set_explanation":
-            await self.set_explanation_callback(update, context)
-        elif data == "cancel_broadcast":
-            user_id = query.from_user.id
-            self.broadcast_mode[user_id] = False
-            await query.edit_message_text("❌ Broadcast cancelled.")
-        elif data == "clean_inactive":
-            await self.clean_inactive_groups(update, context)
-        elif data == "reactivate_all":
-            await self.reactivate_all_groups(update, context)
-        elif data == "refresh_groups":
-            await self.refresh_groups(update, context)
-        elif data == "get_group_links":
-            await self.export_group_links(update, context)
-        elif data.startswith("remove_group_"):
-            chat_id = int(data.split("_")[2])
-            await self.remove_group(update, context, chat_id)
-        elif data.startswith("group_stats_"):
-            chat_id = int(data.split("_")[2])
-            await self.show_group_stats(update, context, chat_id)
-        elif data.startswith("delete_quiz_"):
-            report_id = data[12:]  # Remove "delete_quiz_" prefix
-            await self.handle_delete_quiz(update, context, report_id)
-        elif data.startswith("delete_similar_"):
-            report_id = data[15:]  # Remove "delete_similar_" prefix
-            await self.handle_delete_similar_quizzes(update, context, report_id)
-        elif data.startswith("ignore_report_"):
-            report_id = data[14:]  # Remove "ignore_report_" prefix
-            await self.handle_ignore_report(update, context, report_id)
-        elif data.startswith("view_similar_"):
-            report_id = data[13:]  # Remove "view_similar_" prefix
-            await self.handle_view_similar(update, context, report_id)
-        elif data == "view_reports":
-            await self.handle_view_reports(update, context)
-        elif data == "clear_resolved_reports":
-            await self.handle_clear_resolved_reports(update, context)
-        elif data.startswith("report_back_"):
-            report_id = data[12:]  # Remove "report_back_" prefix
-            await self.handle_report_back(update, context, report_id)
-        elif data == "close_report":
-            await self.handle_close_report(update, context)
-        elif data == "start_menu":
-            await self.handle_start_menu(update, context)
+        handler = self.callback_handlers.get(data)
+        if handler:
+            await handler(update, context)
+            return
+        
+        match = CALLBACK_PREFIX_RE.match(data)
+        if match:
+            action, arg = match.groups()
+            handler, parse_arg = self.callback_prefix_handlers[action]
+            await handler(update, context, parse_arg(arg))
+    
+    async def show_add_quiz_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Explain how to add a quiz poll"""
+        await update.callback_query.edit_message_text(
+            "📝 **Add New Quiz Poll**\n\n"
+            "To add a quiz:\n\n"
+            "1. Click the 📎 attachment icon\n"
+            "2. Select 'Poll'\n"
+            "3. Enter your question and options\n"
+            "4. ✅ **Enable 'Quiz Mode' and set the correct answer**\n"
+            "5. Send the poll to me\n\n"
+            "📢 **Important:** I only accept QUIZ MODE polls (with correct answers)\n"
+            "📢 **Important:** I accept both anonymous and non-anonymous QUIZ MODE polls\n"
+            "📢 **Important:** When sent to groups, quizzes will ALWAYS be NON-ANONYMOUS (voters visible)\n\n"
+            "I'll automatically save it and send it to groups!\n\n"
+            "💡 Group admins can use /rquiz for immediate quizzes\n"
+            "⚠️ Users can report quizzes with /qreport"
+        )
+    
+    async def cancel_broadcast(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Leave broadcast mode without sending"""
+        self.broadcast_mode[update.callback_query.from_user.id] = False
+        await update.callback_query.edit_message_text("❌ Broadcast cancelled.")
     
     async def remove_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE, chat_id: int):
         """Remove a group from the list"""
-        self.mongo.delete_one('groups', {'chat_id': chat_id})
-        self.groups = self.load_groups()
+        await self.mongo.delete_one('groups', {'chat_id': chat_id})
+        
+        # Drop it from the cache rather than reloading every group
+        group = self.groups.pop(chat_id, None)
+        if group and group.get('is_active', True):
+            self.active_group_count -= 1
+        await self.forget_invite_links([chat_id])
         
         await update.callback_query.edit_message_text(
-            f"✅ Group removed from database.\n\n"
-            f"The bot will stop sending quizzes to this group."
+            "✅ Group removed from database.\n\n"
+            "The bot will stop sending quizzes to this group."
         )
     
     async def show_group_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE, chat_id: int):
         """Show statistics for a specific group"""
-        group = self.mongo.find_one('groups', {'chat_id': chat_id})
+        group = self.groups.get(chat_id)
         
         if not group:
             await update.callback_query.answer("Group not found!")
             return
         
-        status = "🟢 Active" if group.get('is_active', True) else "🔴 Inactive"
-        
-        stats_text = (
-            f"📊 **Group Statistics**\n\n"
-            f"🏷️ **Name:** {group['title']}\n"
-            f"🆔 **ID:** {group['chat_id']}\n"
-            f"📅 **Added:** {datetime.fromisoformat(group['added_date']).strftime('%Y-%m-%d')}\n"
-            f"📤 **Auto Quizzes Received:** {group.get('quizzes_received', 0)}\n"
-            f"🎯 **Manual Quizzes Received:** {group.get('manual_quizzes_received', 0)}\n"
-            f"👥 **Members:** {group.get('member_count', 'Unknown')}\n"
-            f"🕐 **Last Activity:** {datetime.fromisoformat(group['last_activity']).strftime('%Y-%m-%d %H:%M')}\n"
-            f"📊 **Status:** {status}\n"
+        stats_text = GROUP_STATS_TEMPLATE(
+            title=group['title'],
+            chat_id=group['chat_id'],
+            added=format_iso_time(group['added_date'], '%Y-%m-%d'),
+            quizzes_received=group.get('quizzes_received', 0),
+            manual_quizzes_received=group.get('manual_quizzes_received', 0),
+            member_count=group.get('member_count', 'Unknown'),
+            last_activity=format_iso_time(group['last_activity'], '%Y-%m-%d %H:%M'),
+            status="🟢 Active" if group.get('is_active', True) else "🔴 Inactive"
         )
         
         keyboard = [
             [InlineKeyboardButton("🚫 Remove Group", callback_data=f"remove_group_{chat_id}")],
-            [InlineKeyboardButton("👥 All Groups", callback_data="manage_groups")]
+            ALL_GROUPS_ROW
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -2215,98 +2630,139 @@ class QuizBot:
         self.application.add_handler(CommandHandler("groupslist", self.quick_groups_list))  # Alternative command
         self.application.add_handler(CommandHandler("grouplinks", self.export_group_links))
         
-        # Handle both text messages and polls
+        # Handle both text messages and polls; broadcast, explanation and
+        # interval input are routed from handle_private_message
         self.application.add_handler(MessageHandler(
-            filters.ChatType.PRIVATE & (filters.TEXT | filters.POLL) & ~filters.COMMAND, 
+            filters.ChatType.PRIVATE & (filters.TEXT | filters.POLL) & ~filters.COMMAND,
             self.handle_private_message
         ))
-        
-        # Handle interval input from settings menu
-        self.application.add_handler(MessageHandler(
-            filters.ChatType.PRIVATE & filters.TEXT & ~filters.COMMAND,
-            self.handle_interval_input
-        ))
-        
+
         self.application.add_handler(CallbackQueryHandler(self.button_handler))
     
     async def start_scheduler(self):
         """Start the quiz scheduler"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.quiz_interval  # Use configurable interval
         while True:
-            await asyncio.sleep(self.quiz_interval)  # Use configurable interval
+            # Sleep to a monotonic deadline so send time doesn't push later ticks back
+            await asyncio.sleep(max(0, next_tick - loop.time()))
             await self.send_random_quiz()
+            next_tick += self.quiz_interval
+            
+            # If a send overran the next tick, skip it rather than sending back-to-back
+            if next_tick <= loop.time():
+                logger.warning("⚠️ Quiz send took longer than the interval, skipping missed ticks")
+                next_tick = loop.time() + self.quiz_interval
     
     async def run_bot(self):
         """Run the bot"""
-        self.application = Application.builder().token(BOT_TOKEN).build()
+        health_runner = await start_health_server()
+        await self.initialize()
+        self.application = (
+            Application.builder()
+            .token(BOT_TOKEN)
+            .rate_limiter(AIORateLimiter(max_retries=3))
+            .build()
+        )
         self.setup_handlers()
         
         # Start the scheduler
-        asyncio.create_task(self.start_scheduler())
+        self.scheduler_task = asyncio.create_task(self.start_scheduler())
         
-        print("🤖 Bot is starting...")
+        logger.info("🤖 Bot is starting...")
         await self.application.initialize()
         await self.application.start()
         await self.application.updater.start_polling()
         
-        quiz_interval_hours = self.quiz_interval / 3600
-        print(f"✅ Bot is now running with MongoDB support!")
-        print(f"⏰ Quiz interval: {quiz_interval_hours} hours")
-        print(f"📊 Loaded {len(self.quizzes)} quizzes and {len(self.groups)} groups from database")
-        print(f"🎯 /rquiz command enabled for group admins")
-        print(f"🔄 /reset command available for admin")
-        print(f"👥 NEW: /grouplist command for detailed group list with invite links")
-        print(f"👥 NEW: /groupslist command for quick group overview")
-        print(f"👥 NEW: /grouplinks command for links export")
-        print(f"⚠️ NEW: /qreport command for users to report quizzes")
-        print(f"🔄 IMPROVED Anti-repeat system active: Tracks last {self.max_recent_track} sent quizzes")
-        print(f"👤 Quiz acceptance: Both anonymous and non-anonymous QUIZ MODE polls accepted")
-        print(f"📤 Quiz sending: ALWAYS sends as NON-ANONYMOUS (voters visible)")
-        print(f"👮 Quiz moderation system active - reports go to admin DM")
-        
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(3600)
+        # One log record for the whole startup banner
+        logger.info("\n".join([
+            "✅ Bot is now running with MongoDB support!",
+            f"⏰ Quiz interval: {self.quiz_interval_hours} hours",
+            f"📊 Loaded {len(self.quizzes)} quizzes and {len(self.groups)} groups from database",
+            "🎯 /rquiz command enabled for group admins",
+            "🔄 /reset command available for admin",
+            "👥 NEW: /grouplist command for detailed group list with invite links",
+            "👥 NEW: /groupslist command for quick group overview",
+            "👥 NEW: /grouplinks command for links export",
+            "⚠️ NEW: /qreport command for users to report quizzes",
+            f"🔄 IMPROVED Anti-repeat system active: Tracks last {self.max_recent_track} sent quizzes",
+            "👤 Quiz acceptance: Both anonymous and non-anonymous QUIZ MODE polls accepted",
+            "📤 Quiz sending: ALWAYS sends as NON-ANONYMOUS (voters visible)",
+            "👮 Quiz moderation system active - reports go to admin DM",
+        ]))
+        
+        # Keep the bot running until asked to shut down
+        try:
+            await self.shutdown_event.wait()
+        finally:
+            # Cancel and await our own tasks so none are left pending when the loop closes
+            tasks = [self.scheduler_task, *self.background_tasks]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+            await self.application.updater.stop()
+            await self.application.stop()
+            await self.application.shutdown()
+            
+            # The final flush replaces any delayed stats write still waiting
+            if self.stats_flush_task:
+                self.stats_flush_task.cancel()
+                await asyncio.gather(self.stats_flush_task, return_exceptions=True)
+                self.stats_flush_task = None
+            await self.flush_stats()
+            await health_runner.cleanup()
 
-def run_flask():
-    """Run Flask app"""
-    app = Flask(__name__)
-    
-    @app.route('/')
-    def home():
-        return "Quiz Poll Bot is running with MongoDB!"
-    
-    @app.route('/health')
-    def health():
-        return "OK", 200
-    
-    print(f"🌐 Flask server starting on port {PORT}")
-    app.run(host='0.0.0.0', port=PORT, debug=False, use_reloader=False)
+async def start_health_server():
+    """Serve the health check endpoints on the bot's event loop"""
+    async def home(request):
+        return web.Response(text="Quiz Poll Bot is running with MongoDB!")
+    
+    async def health(request):
+        return web.Response(text="OK")
+    
+    app = web.Application()
+    app.router.add_get('/', home)
+    app.router.add_get('/health', health)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '0.0.0.0', PORT).start()
+    logger.info("🌐 Health server listening on port %s", PORT)
+    return runner
 
 def run_bot():
-    """Run the bot in its own thread"""
-    loop = asyncio.new_event_loop()
+    """Run the bot and its health server on a new event loop"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
     global bot_instance
     bot_instance = QuizBot()
     
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, bot_instance.shutdown_event.set)
+        except NotImplementedError:
+            pass  # Signal handlers aren't supported on Windows event loops
+    
     try:
         loop.run_until_complete(bot_instance.run_bot())
     except KeyboardInterrupt:
-        print("Bot stopped by user")
+        logger.info("Bot stopped by user")
     except Exception as e:
-        print(f"Bot error: {e}")
+        logger.exception("Bot error: %s", e)
     finally:
         loop.close()
 
 def main():
     """Main function to start both services"""
-    # Start Flask in main thread
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
+    listener = setup_logging()
     
-    # Start bot in current thread (this will block)
-    run_bot()
+    # Start bot and health server in current thread (this will block)
+    try:
+        run_bot()
+    finally:
+        listener.stop()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file